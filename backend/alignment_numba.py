@@ -0,0 +1,125 @@
+"""
+Numba-compiled alignment kernels
+Dynamic programming fills used by the VQE-named Needleman-Wunsch aligner
+and by Smith-Waterman
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def nw_fill_into(s1, s2, match_score, mismatch_penalty, gap_penalty,
+                 scores, traceback, energies):
+    """
+    Fill a global alignment score matrix and its traceback in place
+
+    Args:
+        s1, s2: uint8 arrays of the sequences' ASCII codes
+        match_score, mismatch_penalty, gap_penalty: scoring parameters
+        scores: (n+1, m+1) float64 matrix with its first row/column set
+        traceback: (n+1, m+1) uint8 matrix receiving 0 diag, 1 up, 2 left
+        energies: (n,) array receiving -max(scores[i, :]) for each row i
+
+    Ties prefer diagonal, then up, then left.
+    """
+    n = s1.shape[0]
+    m = s2.shape[0]
+    for i in range(1, n + 1):
+        a = s1[i - 1]
+        row_best = scores[i, 0]
+        for j in range(1, m + 1):
+            diag = scores[i - 1, j - 1] + (match_score if a == s2[j - 1] else mismatch_penalty)
+            delete = scores[i - 1, j] + gap_penalty
+            insert = scores[i, j - 1] + gap_penalty
+            # Strict comparisons keep the first candidate on ties; written
+            # as selects so they compile to conditional moves
+            best = diag
+            move = 0
+            if delete > best:
+                best = delete
+                move = 1
+            if insert > best:
+                best = insert
+                move = 2
+            scores[i, j] = best
+            traceback[i, j] = move
+            if best > row_best:
+                row_best = best
+        energies[i - 1] = -row_best
+
+
+@njit(cache=True)
+def sw_fill_into(s1, s2, match_score, mismatch_penalty, gap_penalty,
+                 scores, traceback):
+    """
+    Fill a local alignment score matrix and its traceback in place
+
+    Args:
+        s1, s2: uint8 arrays of the sequences' ASCII codes
+        match_score, mismatch_penalty, gap_penalty: scoring parameters
+        scores: (n+1, m+1) float64 zero matrix
+        traceback: (n+1, m+1) uint8 matrix receiving 0 diag or zero, 1 up, 2 left
+
+    Ties prefer zero/diagonal, then up, then left.
+    """
+    n = s1.shape[0]
+    m = s2.shape[0]
+    for i in range(1, n + 1):
+        a = s1[i - 1]
+        for j in range(1, m + 1):
+            diag = scores[i - 1, j - 1] + (match_score if a == s2[j - 1] else mismatch_penalty)
+            delete = scores[i - 1, j] + gap_penalty
+            insert = scores[i, j - 1] + gap_penalty
+            best = diag
+            move = 0
+            if delete > best:
+                best = delete
+                move = 1
+            if insert > best:
+                best = insert
+                move = 2
+            if best <= 0.0:
+                best = 0.0
+                move = 0
+            scores[i, j] = best
+            traceback[i, j] = move
+
+
+@njit(cache=True)
+def nw_traceback_into(s1, s2, traceback, aligned1, aligned2, path):
+    """
+    Walk a global alignment traceback from (n, m) back to (0, 0)
+
+    Args:
+        s1, s2: uint8 arrays of the sequences' ASCII codes
+        traceback: (n+1, m+1) matrix of 0 diag, 1 up, 2 left codes
+        aligned1, aligned2, path: (n+m,) uint8 buffers filled from the end
+            with the aligned sequences ('-' for gaps) and the E/I path
+
+    Returns:
+        Offset of the first filled position in the buffers
+    """
+    i = s1.shape[0]
+    j = s2.shape[0]
+    k = i + j
+    while i > 0 or j > 0:
+        k -= 1
+        move = traceback[i, j]
+        if move == 0:
+            aligned1[k] = s1[i - 1]
+            aligned2[k] = s2[j - 1]
+            path[k] = 69 if s1[i - 1] == s2[j - 1] else 73  # 'E' / 'I'
+            i -= 1
+            j -= 1
+        elif move == 1:
+            aligned1[k] = s1[i - 1]
+            aligned2[k] = 45  # '-'
+            path[k] = 73
+            i -= 1
+        else:
+            aligned1[k] = 45
+            aligned2[k] = s2[j - 1]
+            path[k] = 73
+            j -= 1
+    return k
@@ -1,17 +1,86 @@
 """
 Classical Viterbi Algorithm Implementation
-Uses hmmlearn library for baseline comparison with Quantum Viterbi
+Uses a Numba-compiled log-space Viterbi (hmmlearn fallback) for baseline
+comparison with Quantum Viterbi
 """
 
 import numpy as np
 import time
 from hmmlearn import hmm
-from .hmm_models import base_to_int, validate_sequence
+from .hmm_models import get_log_params, validate_and_encode_sequence
+
+try:
+    from .viterbi_numba import batch_viterbi_log, viterbi_log, viterbi_log_n2
+except ImportError:
+    # Numba not installed: decode with hmmlearn instead
+    batch_viterbi_log = viterbi_log = viterbi_log_n2 = None
+
+
+# hmmlearn models keyed by their parameters, so fallback decodes skip
+# model construction and parameter validation
+_MODEL_CACHE = {}
+
+
+def _get_hmmlearn_model(hmm_config: dict):
+    """
+    Get a configured hmmlearn model for an HMM config, building it once
+
+    Args:
+        hmm_config: HMM configuration dictionary
+
+    Returns:
+        hmmlearn model with start, transition and emission parameters set
+    """
+    n_states = hmm_config['n_states']
+    start_prob = np.asarray(hmm_config['start_prob'], dtype=np.float64)
+    trans_prob = np.asarray(hmm_config['trans_prob'], dtype=np.float64)
+    emit_prob = np.asarray(hmm_config['emit_prob'], dtype=np.float64)
+
+    key = (n_states, start_prob.tobytes(), trans_prob.tobytes(), emit_prob.tobytes())
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        return model
+
+    # CategoricalHMM matches the one-symbol-per-step observations; newer
+    # MultinomialHMM models n_trials multinomials and is only used on old
+    # hmmlearn releases where it still had the per-symbol semantics.
+    # 'scaling' keeps forward/backward scoring out of log space; Viterbi
+    # decoding itself is unaffected
+    try:
+        model = hmm.CategoricalHMM(n_components=n_states, random_state=42,
+                                   implementation='scaling')
+    except AttributeError:
+        model = hmm.MultinomialHMM(n_components=n_states, n_iter=100)
+
+    # Set HMM parameters
+    model.startprob_ = start_prob
+    model.transmat_ = trans_prob
+    model.emissionprob_ = emit_prob
+
+    _MODEL_CACHE[key] = model
+    return model
+
+
+def _decode_hmmlearn(observations: np.ndarray, hmm_config: dict) -> tuple:
+    """
+    Viterbi decoding through hmmlearn (used when Numba is unavailable)
+
+    Args:
+        observations: 1D array of observation indices
+        hmm_config: HMM configuration dictionary
+
+    Returns:
+        Tuple of (log probability of the best path, state index array)
+    """
+    model = _get_hmmlearn_model(hmm_config)
+
+    # hmmlearn requires a 2D (n_samples, 1) observation array
+    return model.decode(observations.reshape(-1, 1).astype(np.int64), algorithm='viterbi')
 
 
 def run_classical_viterbi(sequence: str, hmm_config: dict) -> dict:
     """
-    Run classical Viterbi algorithm using hmmlearn
+    Run classical Viterbi algorithm (log-space dynamic programming)
 
     Args:
         sequence: DNA sequence string (A, C, G, T)
@@ -26,53 +95,31 @@ def run_classical_viterbi(sequence: str, hmm_config: dict) -> dict:
         - method: 'classical'
         - sequence_length: Length of input sequence
     """
-    # Validate and clean sequence
-    cleaned_seq = validate_sequence(sequence)
+    # Validate, clean and convert DNA sequence to integer observations
+    # A=0, C=1, G=2, T=3
+    observations = validate_and_encode_sequence(sequence)
 
     # Start timer
     start_time = time.perf_counter()
 
-    # Convert DNA sequence to integer observations
-    # A=0, C=1, G=2, T=3
-    # New hmmlearn version requires 1D or 2D array
-    observations = np.array([base_to_int(base) for base in cleaned_seq]).reshape(-1, 1)
-
-    # Extract HMM parameters
-    n_states = hmm_config['n_states']
-    states = hmm_config['states']
-    start_prob = hmm_config['start_prob']
-    trans_prob = hmm_config['trans_prob']
-    emit_prob = hmm_config['emit_prob']
-
     try:
-        # Create CategoricalHMM model (renamed from MultinomialHMM in newer versions)
-        # Try new version first
-        try:
-            model = hmm.CategoricalHMM(n_components=n_states, random_state=42)
-        except AttributeError:
-            # Fall back to MultinomialHMM for older versions
-            model = hmm.MultinomialHMM(n_components=n_states, n_iter=100)
-
-        # Set HMM parameters
-        model.startprob_ = start_prob
-        model.transmat_ = trans_prob
-        model.emissionprob_ = emit_prob
-
-        # Run Viterbi decoding
-        # Newer versions might require different API
-        try:
-            hidden_states = model.predict(observations)
-            log_probability = model.score(observations)
-        except TypeError:
-            # Try alternative API for newer hmmlearn
-            hidden_states, log_probability = model.decode(observations, algorithm='viterbi')
+        params = get_log_params(hmm_config)
+
+        if viterbi_log is not None:
+            # The 2-state model has a branchless specialized kernel
+            kernel = viterbi_log_n2 if params.n_states == 2 else viterbi_log
+            log_probability, hidden_states = kernel(
+                observations, params.log_start, params.log_trans, params.log_emit_T
+            )
+        else:
+            log_probability, hidden_states = _decode_hmmlearn(observations, hmm_config)
 
-        # Convert state indices to state labels
-        decoded_path = [states[int(state)] for state in hidden_states]
-        decoded_path_string = ''.join(decoded_path)
+        # Convert state indices to state labels with one gather
+        decoded_path_string = np.take(params.states_u8, hidden_states).tobytes().decode('ascii')
+        decoded_path = list(decoded_path_string)
 
     except Exception as e:
-        # If both approaches fail, return error details
+        # If decoding fails, return error details
         raise ValueError(f"Failed to run Viterbi: {str(e)}. Ensure sequence is valid DNA (ACGT only)")
 
     # End timer
@@ -85,8 +132,8 @@ def run_classical_viterbi(sequence: str, hmm_config: dict) -> dict:
         'log_probability': float(log_probability),
         'runtime_ms': round(runtime_ms, 2),
         'method': 'classical',
-        'sequence_length': len(cleaned_seq),
-        'n_states': n_states,
+        'sequence_length': len(observations),
+        'n_states': params.n_states,
         'algorithm': 'Viterbi (Dynamic Programming)'
     }
 
@@ -121,30 +168,81 @@ def batch_classical_viterbi(sequences: list, hmm_config: dict) -> list:
     """
     Run classical Viterbi on multiple sequences
 
+    Valid sequences are padded into one observation matrix and decoded by
+    a single parallel kernel call; invalid ones get an error entry.
+
     Args:
         sequences: List of DNA sequence strings
         hmm_config: HMM configuration
 
     Returns:
-        List of result dictionaries
+        List of result dictionaries (runtime_ms is the amortized batch time)
     """
-    results = []
+    if batch_viterbi_log is None:
+        return [_run_or_error(idx, seq, hmm_config) for idx, seq in enumerate(sequences)]
+
+    results = [None] * len(sequences)
+    encoded = []
+    valid_ids = []
 
     for idx, seq in enumerate(sequences):
         try:
-            result = run_classical_viterbi(seq, hmm_config)
-            result['sequence_id'] = idx
-            results.append(result)
+            encoded.append(validate_and_encode_sequence(seq))
+            valid_ids.append(idx)
         except Exception as e:
-            results.append({
+            results[idx] = {
                 'sequence_id': idx,
                 'error': str(e),
                 'method': 'classical'
-            })
+            }
+
+    if encoded:
+        start_time = time.perf_counter()
+
+        # Pad to (B, T_max); padding is never read past each row's length
+        lengths = np.array([len(obs) for obs in encoded], dtype=np.int32)
+        obs_matrix = np.zeros((len(encoded), lengths.max()), dtype=np.uint8)
+        for row, obs in enumerate(encoded):
+            obs_matrix[row, :len(obs)] = obs
+
+        params = get_log_params(hmm_config)
+        logprobs, paths = batch_viterbi_log(
+            obs_matrix, lengths, params.log_start, params.log_trans, params.log_emit_T
+        )
+
+        runtime_ms = (time.perf_counter() - start_time) * 1000 / len(encoded)
+
+        for row, idx in enumerate(valid_ids):
+            decoded_path_string = np.take(params.states_u8, paths[row, :lengths[row]]).tobytes().decode('ascii')
+            results[idx] = {
+                'decoded_path': list(decoded_path_string),
+                'decoded_path_string': decoded_path_string,
+                'log_probability': float(logprobs[row]),
+                'runtime_ms': round(runtime_ms, 2),
+                'method': 'classical',
+                'sequence_length': int(lengths[row]),
+                'n_states': params.n_states,
+                'algorithm': 'Viterbi (Dynamic Programming)',
+                'sequence_id': idx
+            }
 
     return results
 
 
+def _run_or_error(idx: int, seq: str, hmm_config: dict) -> dict:
+    """Run classical Viterbi on one sequence, returning an error entry on failure"""
+    try:
+        result = run_classical_viterbi(seq, hmm_config)
+        result['sequence_id'] = idx
+        return result
+    except Exception as e:
+        return {
+            'sequence_id': idx,
+            'error': str(e),
+            'method': 'classical'
+        }
+
+
 if __name__ == "__main__":
     # Test the classical Viterbi implementation
     from hmm_models import get_hmm_config
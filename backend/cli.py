@@ -3,19 +3,24 @@
 QGENOME CLI - Command Line Interface for Quantum Genome Analysis
 """
 import asyncio
+import contextlib
+import io
+import mmap
+import os
 import sys
-import json
 from typing import Optional, List
 import argparse
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from .db import connect_to_mongo, close_mongo_connection
 from .mongo_operations import (
-    save_dataset, get_dataset, list_datasets, delete_dataset,
+    save_dataset, get_dataset, list_dataset_summaries, delete_dataset,
     create_processing_job, get_processing_job, list_processing_jobs,
     update_processing_job
 )
@@ -23,6 +28,49 @@ from .models import Dataset, ProcessingStatus, AlgorithmType
 from .processing_logger import create_job_logger
 
 
+_DUMP_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+)
+
+
+def _dump(obj) -> str:
+    """Pretty-print a result as JSON (handles NumPy arrays and datetimes)"""
+    return orjson.dumps(obj, option=_DUMP_OPTIONS).decode()
+
+
+def read_fasta(file_path: str) -> List[str]:
+    """Read all sequences from a FASTA file via a read-only memory map"""
+    sequences = []
+    
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sequences
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = 0
+            while start < size:
+                if data[start:start + 1] == b'>':
+                    # Skip the header line
+                    header_end = data.find(b'\n', start)
+                    if header_end == -1:
+                        break
+                    start = header_end + 1
+                    continue
+                
+                end = data.find(b'\n>', start)
+                if end == -1:
+                    end = size
+                
+                # Only this record is copied; split() drops newlines and \r
+                seq = b''.join(data[start:end].split())
+                if seq:
+                    sequences.append(seq.decode('ascii'))
+                start = end + 1
+    
+    return sequences
+
+
 class QGENOMECLI:
     """Main CLI class for QGENOME operations"""
     
@@ -65,7 +113,7 @@ class QGENOMECLI:
         """List all datasets"""
         await self.connect()
         
-        datasets = await list_datasets(limit=limit)
+        datasets = await list_dataset_summaries(limit=limit)
         
         if not datasets:
             print("No datasets found.")
@@ -76,13 +124,13 @@ class QGENOMECLI:
         print(f"{'='*80}\n")
         
         for i, ds in enumerate(datasets, 1):
-            print(f"{i}. {ds.name} (ID: {ds.id})")
-            print(f"   Sequences: {len(ds.sequences)}")
-            print(f"   Created: {ds.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-            if ds.description:
-                print(f"   Description: {ds.description}")
-            if ds.tags:
-                print(f"   Tags: {', '.join(ds.tags)}")
+            print(f"{i}. {ds['name']} (ID: {ds['id']})")
+            print(f"   Sequences: {ds['sequences_count']}")
+            print(f"   Created: {ds['created_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+            if ds.get('description'):
+                print(f"   Description: {ds['description']}")
+            if ds.get('tags'):
+                print(f"   Tags: {', '.join(ds['tags'])}")
             print()
     
     async def get_dataset_cmd(self, dataset_id: str):
@@ -206,7 +254,7 @@ class QGENOMECLI:
         
         if job.result:
             print(f"\nResult:")
-            print(json.dumps(job.result, indent=2))
+            print(_dump(job.result))
         
         if job.error_message:
             print(f"\nError: {job.error_message}")
@@ -216,22 +264,8 @@ class QGENOMECLI:
     # Utility operations
     async def import_fasta(self, file_path: str, dataset_name: str = None):
         """Import sequences from FASTA file"""
-        sequences = []
-        current_seq = []
-        
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('>'):
-                        if current_seq:
-                            sequences.append(''.join(current_seq))
-                            current_seq = []
-                    else:
-                        current_seq.append(line)
-                
-                if current_seq:
-                    sequences.append(''.join(current_seq))
+            sequences = read_fasta(file_path)
             
             if not sequences:
                 print("No sequences found in file.")
@@ -247,9 +281,11 @@ class QGENOMECLI:
             print(f"✗ Error importing file: {str(e)}")
 
 
-async def main():
-    """Main CLI entry point"""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser"""
     parser = argparse.ArgumentParser(description="QGENOME CLI - Quantum Genome Analysis")
+    parser.add_argument('--server-mode', metavar='SOCKET', help='Serve commands on a Unix socket over one MongoDB connection')
+    parser.add_argument('--socket', metavar='SOCKET', help='Send the command to a CLI server instead of connecting directly')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Dataset commands
@@ -292,33 +328,125 @@ async def main():
     get_job = job_subparsers.add_parser('get', help='Get job details')
     get_job.add_argument('job_id', help='Job ID')
     
+    return parser
+
+
+async def dispatch(cli: QGENOMECLI, parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Run the command described by parsed arguments"""
+    if args.command == 'dataset':
+        if args.dataset_command == 'create':
+            await cli.create_dataset(args.name, args.sequences, args.description, args.tags)
+        elif args.dataset_command == 'list':
+            await cli.list_datasets_cmd(args.limit)
+        elif args.dataset_command == 'get':
+            await cli.get_dataset_cmd(args.dataset_id)
+        elif args.dataset_command == 'delete':
+            await cli.delete_dataset_cmd(args.dataset_id)
+        elif args.dataset_command == 'import':
+            await cli.import_fasta(args.file_path, args.name)
+    
+    elif args.command == 'job':
+        if args.job_command == 'create':
+            await cli.create_job(args.name, args.algorithm, args.sequences)
+        elif args.job_command == 'list':
+            await cli.list_jobs(args.status, args.algorithm, args.limit)
+        elif args.job_command == 'get':
+            await cli.get_job(args.job_id)
+    
+    else:
+        parser.print_help()
+
+
+async def serve(socket_path: str):
+    """Serve CLI commands on a Unix socket, reusing one MongoDB connection
+    
+    Each request is one JSON line {"argv": [...]}; the reply is one JSON
+    line {"ok": bool, "output": str} with everything the command printed.
+    """
+    parser = build_parser()
+    cli = QGENOMECLI()
+    await cli.connect()
+    # Commands print to stdout, so run them one at a time while capturing it
+    lock = asyncio.Lock()
+    
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                output = io.StringIO()
+                ok = True
+                async with lock:
+                    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                        try:
+                            args = parser.parse_args(orjson.loads(line)["argv"])
+                            await dispatch(cli, parser, args)
+                        except SystemExit:
+                            # argparse errors and --help exit; keep serving
+                            ok = False
+                        except Exception as e:
+                            ok = False
+                            print(f"✗ {str(e)}")
+                writer.write(orjson.dumps({"ok": ok, "output": output.getvalue()}) + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+    
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    print(f"✓ Serving QGENOME CLI on {socket_path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await cli.disconnect()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+async def send_to_server(socket_path: str, argv: List[str]) -> bool:
+    """Send one command to a running CLI server and print its output"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        writer.write(orjson.dumps({"argv": argv}) + b"\n")
+        await writer.drain()
+        reply = orjson.loads(await reader.readline())
+    finally:
+        writer.close()
+    print(reply["output"], end="")
+    return reply["ok"]
+
+
+def _strip_socket_args(argv: List[str]) -> List[str]:
+    """Remove the --socket option so the rest can be forwarded to a server"""
+    forwarded = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == '--socket':
+            skip = True
+        elif not arg.startswith('--socket='):
+            forwarded.append(arg)
+    return forwarded
+
+
+async def main():
+    """Main CLI entry point"""
+    parser = build_parser()
     args = parser.parse_args()
     
+    if args.server_mode:
+        await serve(args.server_mode)
+        return
+    
+    if args.socket:
+        ok = await send_to_server(args.socket, _strip_socket_args(sys.argv[1:]))
+        if not ok:
+            sys.exit(1)
+        return
+    
     cli = QGENOMECLI()
     
     try:
-        if args.command == 'dataset':
-            if args.dataset_command == 'create':
-                await cli.create_dataset(args.name, args.sequences, args.description, args.tags)
-            elif args.dataset_command == 'list':
-                await cli.list_datasets_cmd(args.limit)
-            elif args.dataset_command == 'get':
-                await cli.get_dataset_cmd(args.dataset_id)
-            elif args.dataset_command == 'delete':
-                await cli.delete_dataset_cmd(args.dataset_id)
-            elif args.dataset_command == 'import':
-                await cli.import_fasta(args.file_path, args.name)
-        
-        elif args.command == 'job':
-            if args.job_command == 'create':
-                await cli.create_job(args.name, args.algorithm, args.sequences)
-            elif args.job_command == 'list':
-                await cli.list_jobs(args.status, args.algorithm, args.limit)
-            elif args.job_command == 'get':
-                await cli.get_job(args.job_id)
-        
-        else:
-            parser.print_help()
+        await dispatch(cli, parser, args)
     
     finally:
         await cli.disconnect()
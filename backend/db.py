@@ -1,7 +1,8 @@
 from __future__ import annotations
+import asyncio
 import os
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
@@ -18,6 +19,13 @@ COLLECTION_NAME = "sequence_runs"
 _mongodb_client: Optional[AsyncIOMotorClient] = None
 _database: Optional[AsyncIOMotorDatabase] = None
 
+# Write-behind queue for run records (started by start_run_writer)
+_run_queue: Optional[asyncio.Queue] = None
+_run_writer: Optional[asyncio.Task] = None
+RUN_BATCH_SIZE = 100
+RUN_FLUSH_INTERVAL = 0.1  # Seconds a queued run may wait for batch-mates
+_FLUSH = object()  # Queue marker: write the pending batch without waiting
+
 
 class SequenceRunResponse(BaseModel):
     """API response model for sequence runs"""
@@ -26,11 +34,22 @@ class SequenceRunResponse(BaseModel):
     sequence_a: str
     sequence_b: Optional[str] = None
     score: float
-    result: dict
-    created_at: datetime
+    result: Optional[dict] = None  # Omitted by summary listings
+    created_at: datetime  # Serialized by model_dump(mode="json")
 
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
+
+def _run_response(doc: dict) -> SequenceRunResponse:
+    """Build a response from a stored run document without re-validating it"""
+    # Documents are written only by this module, so validation is skipped
+    return SequenceRunResponse.model_construct(
+        id=str(doc["_id"]),
+        run_type=doc["run_type"],
+        sequence_a=doc["sequence_a"],
+        sequence_b=doc.get("sequence_b"),
+        score=doc["score"],
+        result=doc.get("result"),
+        created_at=doc["created_at"]
+    )
 
 
 async def connect_to_mongo():
@@ -39,14 +58,40 @@ async def connect_to_mongo():
     _mongodb_client = AsyncIOMotorClient(MONGODB_URL)
     _database = _mongodb_client[DATABASE_NAME]
 
-    # Create indexes for performance
-    collection = _database[COLLECTION_NAME]
-    await collection.create_index("run_type")
-    await collection.create_index([("created_at", -1)])  # Descending for recent-first queries
+    # Create indexes for performance (skipped when they already exist),
+    # checking the collections concurrently
+    await asyncio.gather(
+        _ensure_indexes(_database[COLLECTION_NAME], [
+            [("run_type", 1), ("created_at", -1)],  # Serves the run_type filter and the recent-first sort together
+            [("created_at", -1)],  # Descending for recent-first queries
+        ], obsolete=("run_type_1",)),  # Prefix of the compound index
+        _ensure_indexes(_database["processing_jobs"], [
+            [("status", 1), ("algorithm", 1), ("created_at", -1)],  # /jobs filters, newest first
+        ]),
+        _ensure_indexes(_database["datasets"], [
+            [("created_at", -1)],
+        ]),
+    )
 
     print(f"Connected to MongoDB at {MONGODB_URL}, database: {DATABASE_NAME}")
 
 
+async def _ensure_indexes(collection, specs: list, obsolete: tuple = ()):
+    """Create each (field, direction) index spec that the collection lacks
+
+    Indexes named in obsolete (superseded by a spec) are dropped if present.
+    """
+    existing = await collection.index_information()
+    missing = [
+        keys for keys in specs
+        if "_".join(f"{field}_{direction}" for field, direction in keys) not in existing
+    ]
+    await asyncio.gather(
+        *(collection.create_index(keys, background=True) for keys in missing),
+        *(collection.drop_index(name) for name in obsolete if name in existing),
+    )
+
+
 async def close_mongo_connection():
     """Close MongoDB connection on app shutdown"""
     global _mongodb_client
@@ -68,6 +113,25 @@ async def get_collection():
     return db[COLLECTION_NAME]
 
 
+def _run_document(
+    run_type: str,
+    sequence_a: str,
+    sequence_b: Optional[str],
+    score: float,
+    result: dict,
+    created_at: datetime
+) -> dict:
+    """Build a sequence_runs document"""
+    return {
+        "run_type": run_type,
+        "sequence_a": sequence_a,
+        "sequence_b": sequence_b,
+        "score": score,
+        "result": result,  # Native dict storage (no JSON stringification)
+        "created_at": created_at
+    }
+
+
 async def save_run(
     run_type: str,
     sequence_a: str,
@@ -90,73 +154,182 @@ async def save_run(
     """
     collection = await get_collection()
 
-    # Create document
-    doc = {
-        "run_type": run_type,
-        "sequence_a": sequence_a,
-        "sequence_b": sequence_b,
-        "score": score,
-        "result": result,  # Native dict storage (no JSON stringification)
-        "created_at": datetime.utcnow()
-    }
-
-    # Insert and get result
-    insert_result = await collection.insert_one(doc)
+    doc = _run_document(run_type, sequence_a, sequence_b, score, result, datetime.utcnow())
 
-    # Fetch the inserted document to return complete object
-    created_doc = await collection.find_one({"_id": insert_result.inserted_id})
+    # Insert; the driver sets doc["_id"], so no read-back is needed
+    await collection.insert_one(doc)
 
     # Convert to response model
-    return SequenceRunResponse(
-        id=str(created_doc["_id"]),
-        run_type=created_doc["run_type"],
-        sequence_a=created_doc["sequence_a"],
-        sequence_b=created_doc.get("sequence_b"),
-        score=created_doc["score"],
-        result=created_doc["result"],
-        created_at=created_doc["created_at"]
-    )
+    return _run_response(doc)
 
 
-async def fetch_runs(
-    run_type: Optional[str] = None,
-    limit: int = 10
-) -> list[SequenceRunResponse]:
+async def save_runs_bulk(records: list[dict]) -> list[str]:
     """
-    Fetch sequence runs with optional filtering and pagination.
+    Create many sequence run records in one round trip.
 
     Args:
-        run_type: Filter by run type (optional)
-        limit: Maximum number of results (default 10, max 50)
+        records: Dicts with run_type, sequence_a, sequence_b, score and result
 
     Returns:
-        List of SequenceRunResponse objects, sorted by created_at descending
+        List of generated IDs, in the order of records
     """
+    if not records:
+        return []
+
     collection = await get_collection()
 
+    # One timestamp for the whole batch, as the runs were produced together
+    now = datetime.utcnow()
+    docs = [
+        _run_document(
+            record["run_type"], record["sequence_a"], record.get("sequence_b"),
+            record["score"], record["result"], now
+        )
+        for record in records
+    ]
+
+    # Unordered so the server need not stop at the first failed document
+    res = await collection.insert_many(docs, ordered=False)
+
+    return [str(oid) for oid in res.inserted_ids]
+
+
+def _runs_cursor(collection, run_type: Optional[str], limit: int, summary: bool):
+    """Build the recent-first runs cursor for iter_runs"""
     # Build query filter
     query_filter = {}
     if run_type:
         query_filter["run_type"] = run_type
 
+    # Summary listings skip the result blob entirely on the server
+    projection = {"result": 0} if summary else None
+
     # Execute query with sort and limit
-    cursor = collection.find(query_filter).sort("created_at", -1).limit(min(limit, 50))
-
-    # Convert cursor to list and map to response models
-    documents = await cursor.to_list(length=limit)
-
-    return [
-        SequenceRunResponse(
-            id=str(doc["_id"]),
-            run_type=doc["run_type"],
-            sequence_a=doc["sequence_a"],
-            sequence_b=doc.get("sequence_b"),
-            score=doc["score"],
-            result=doc["result"],
-            created_at=doc["created_at"]
-        )
-        for doc in documents
-    ]
+    cursor = collection.find(query_filter, projection).sort("created_at", -1).limit(min(limit, 50))
+    if run_type:
+        # Filtered listing reads one run_type range, already in created_at order
+        cursor = cursor.hint([("run_type", 1), ("created_at", -1)])
+    else:
+        # Unfiltered listing walks the created_at index in order
+        cursor = cursor.hint([("created_at", -1)])
+    return cursor
+
+
+async def queue_run(
+    run_type: str,
+    sequence_a: str,
+    sequence_b: Optional[str],
+    score: float,
+    result: dict
+) -> None:
+    """
+    Record a sequence run without waiting for the database.
+
+    The run is stamped now and handed to the background writer, which
+    inserts queued runs in batches. Without a running writer (e.g. outside
+    the API) the run is saved immediately instead.
+    """
+    if _run_queue is None:
+        await save_run(run_type, sequence_a, sequence_b, score, result)
+        return
+    _run_queue.put_nowait(_run_document(run_type, sequence_a, sequence_b, score, result, datetime.utcnow()))
+
+
+async def _write_queued_runs(queue: asyncio.Queue):
+    """Insert queued runs in batches of up to RUN_BATCH_SIZE until a None sentinel"""
+    loop = asyncio.get_running_loop()
+    while True:
+        doc = await queue.get()
+        if doc is None:
+            queue.task_done()
+            return
+        if doc is _FLUSH:
+            queue.task_done()
+            continue
+        batch = [doc]
+        taken = 1
+        stopping = False
+
+        # Gather batch-mates until the batch is full, the first run has
+        # waited RUN_FLUSH_INTERVAL or a flush is requested
+        deadline = loop.time() + RUN_FLUSH_INTERVAL
+        while len(batch) < RUN_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                doc = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            taken += 1
+            if doc is None:
+                stopping = True
+                break
+            if doc is _FLUSH:
+                break
+            batch.append(doc)
+
+        try:
+            collection = await get_collection()
+            await collection.insert_many(batch, ordered=False)
+        except Exception as exc:
+            print(f"Failed to write {len(batch)} queued runs: {exc}")
+        for _ in range(taken):
+            queue.task_done()
+
+        if stopping:
+            return
+
+
+async def flush_run_queue():
+    """Wait until every run queued so far has been written
+
+    Listings call this first so a client re-listing runs right after
+    creating one (as the frontend does) sees it.
+    """
+    if _run_writer is None or _run_writer.done():
+        return
+    _run_queue.put_nowait(_FLUSH)
+    await _run_queue.join()
+
+
+def start_run_writer():
+    """Start the background run writer (call after connect_to_mongo)"""
+    global _run_queue, _run_writer
+    _run_queue = asyncio.Queue()
+    _run_writer = asyncio.create_task(_write_queued_runs(_run_queue))
+
+
+async def stop_run_writer():
+    """Flush every queued run and stop the writer (call before closing Mongo)"""
+    global _run_queue, _run_writer
+    if _run_writer is None:
+        return
+    _run_queue.put_nowait(None)
+    await _run_writer
+    _run_queue = None
+    _run_writer = None
+
+
+async def iter_runs(
+    run_type: Optional[str] = None,
+    limit: int = 10,
+    summary: bool = False
+) -> AsyncIterator[SequenceRunResponse]:
+    """
+    Yield sequence runs one at a time as the cursor delivers them.
+
+    Args:
+        run_type: Filter by run type (optional)
+        limit: Maximum number of results (default 10, max 50)
+        summary: Leave out the (potentially large) result field
+
+    Runs come sorted by created_at descending; the page is never held in
+    memory as a whole.
+    """
+    collection = await get_collection()
+    async for doc in _runs_cursor(collection, run_type, limit, summary):
+        yield _run_response(doc)
 
 
 async def get_run_by_id(run_id: str) -> Optional[SequenceRunResponse]:
@@ -180,15 +353,7 @@ async def get_run_by_id(run_id: str) -> Optional[SequenceRunResponse]:
     if not doc:
         return None
 
-    return SequenceRunResponse(
-        id=str(doc["_id"]),
-        run_type=doc["run_type"],
-        sequence_a=doc["sequence_a"],
-        sequence_b=doc.get("sequence_b"),
-        score=doc["score"],
-        result=doc["result"],
-        created_at=doc["created_at"]
-    )
+    return _run_response(doc)
 
 
 async def update_run(
@@ -234,15 +399,7 @@ async def update_run(
     if not updated_doc:
         return None
 
-    return SequenceRunResponse(
-        id=str(updated_doc["_id"]),
-        run_type=updated_doc["run_type"],
-        sequence_a=updated_doc["sequence_a"],
-        sequence_b=updated_doc.get("sequence_b"),
-        score=updated_doc["score"],
-        result=updated_doc["result"],
-        created_at=updated_doc["created_at"]
-    )
+    return _run_response(updated_doc)
 
 
 async def delete_run(run_id: str) -> bool:
@@ -3,6 +3,9 @@ HMM Model Configurations for QGENOME
 Defines transition and emission probability matrices for DNA sequence analysis
 """
 
+import functools
+from typing import Literal, NamedTuple, Optional, Tuple
+
 import numpy as np
 
 # HMM model configurations for different genomic structures
@@ -60,6 +63,10 @@ HMM_CONFIGS = {
     }
 }
 
+# Names of the models in HMM_CONFIGS, so request models reject unknown
+# names while parsing
+HMMModelName = Literal["2-state-exon-intron", "3-state-promoter-exon-intron"]
+
 
 def get_hmm_config(model_name: str) -> dict:
     """
@@ -81,6 +88,101 @@ def get_hmm_config(model_name: str) -> dict:
     return HMM_CONFIGS[model_name]
 
 
+class LogHMMParams(NamedTuple):
+    """Log-space HMM parameters laid out for the Viterbi kernels"""
+    log_start: np.ndarray   # (n_states,)
+    log_trans: np.ndarray   # (n_states, n_states) [from][to]
+    log_emit_T: np.ndarray  # (4, n_states) [nucleotide][state]
+    states: Tuple[str, ...]
+    n_states: int
+    states_u8: np.ndarray   # (n_states,) ASCII code of each state label
+
+
+def build_log_hmm_config(hmm_config: dict) -> LogHMMParams:
+    """
+    Precompute log-space parameters for an HMM configuration
+
+    Args:
+        hmm_config: HMM configuration dictionary
+
+    Returns:
+        LogHMMParams with C-contiguous float32 arrays
+
+    Raises:
+        ValueError: If a state label is not a single ASCII character
+    """
+    states = tuple(hmm_config['states'])
+    if not all(len(state) == 1 and state.isascii() for state in states):
+        raise ValueError(f"State labels must be single ASCII characters: {states}")
+
+    # Zero probabilities become -inf, which the Viterbi DP handles naturally
+    with np.errstate(divide='ignore'):
+        log_start = np.log(np.asarray(hmm_config['start_prob'], dtype=np.float64))
+        log_trans = np.log(np.asarray(hmm_config['trans_prob'], dtype=np.float64))
+        log_emit = np.log(np.asarray(hmm_config['emit_prob'], dtype=np.float64))
+
+    return LogHMMParams(
+        log_start=np.ascontiguousarray(log_start, dtype=np.float32),
+        log_trans=np.ascontiguousarray(log_trans, dtype=np.float32),
+        # Transposed so each observation reads one contiguous row
+        log_emit_T=np.ascontiguousarray(log_emit.T, dtype=np.float32),
+        states=states,
+        n_states=hmm_config['n_states'],
+        states_u8=np.frombuffer(''.join(states).encode('ascii'), dtype=np.uint8).copy()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_log_hmm_config(model_name: str) -> LogHMMParams:
+    """
+    Get cached log-space parameters for a named HMM model
+
+    Args:
+        model_name: Name of the HMM model
+
+    Returns:
+        LogHMMParams for the model
+
+    Raises:
+        ValueError: If model name not found
+    """
+    return build_log_hmm_config(get_hmm_config(model_name))
+
+
+# Registered config dicts by identity, so callers holding a config can
+# reach the cached log parameters
+_CONFIG_NAMES = {id(config): name for name, config in HMM_CONFIGS.items()}
+
+
+def get_model_name(hmm_config: dict) -> Optional[str]:
+    """
+    Get the registered name of an HMM configuration
+
+    Args:
+        hmm_config: HMM configuration dictionary
+
+    Returns:
+        Model name, or None for configs not in HMM_CONFIGS
+    """
+    return _CONFIG_NAMES.get(id(hmm_config))
+
+
+def get_log_params(hmm_config: dict) -> LogHMMParams:
+    """
+    Get log-space parameters for an HMM configuration
+
+    Args:
+        hmm_config: HMM configuration dictionary
+
+    Returns:
+        LogHMMParams (cached for registered models)
+    """
+    model_name = get_model_name(hmm_config)
+    if model_name is not None:
+        return get_log_hmm_config(model_name)
+    return build_log_hmm_config(hmm_config)
+
+
 def list_available_models() -> list:
     """
     Get list of available HMM models
@@ -121,6 +223,11 @@ def base_to_int(base: str) -> int:
     return mapping[base_upper]
 
 
+# Byte -> nucleotide index lookup table (255 marks an invalid byte)
+_BASE_LUT = np.full(256, 255, dtype=np.uint8)
+_BASE_LUT[[ord(c) for c in 'ACGTacgt']] = [0, 1, 2, 3, 0, 1, 2, 3]
+
+
 def int_to_base(index: int) -> str:
     """
     Convert integer index to DNA base
@@ -135,6 +242,45 @@ def int_to_base(index: int) -> str:
     return mapping[index]
 
 
+# Bytes accepted as nucleotides, and whitespace stripped before validation
+_VALID_MASK = np.zeros(256, dtype=np.bool_)
+_VALID_MASK[[ord(c) for c in 'ACGTacgt']] = True
+_WHITESPACE_MASK = np.zeros(256, dtype=np.bool_)
+_WHITESPACE_MASK[[ord(c) for c in ' \n\r\t']] = True
+
+
+def _clean_sequence_bytes(sequence: str) -> np.ndarray:
+    """
+    Strip whitespace, validate and uppercase a sequence as raw bytes
+
+    Args:
+        sequence: DNA sequence string
+
+    Returns:
+        uint8 array of uppercase ASCII nucleotides
+
+    Raises:
+        ValueError: If sequence is invalid, empty or too long
+    """
+    buf = np.frombuffer(sequence.encode('utf-8'), dtype=np.uint8)
+    buf = buf[~_WHITESPACE_MASK[buf]]
+
+    # Check for invalid characters
+    if not _VALID_MASK[buf].all():
+        invalid_bases = set(buf.tobytes().decode('utf-8').upper()) - set('ACGT')
+        raise ValueError(f"Sequence contains invalid nucleotides: {invalid_bases}")
+
+    # Check length
+    if len(buf) == 0:
+        raise ValueError("Sequence is empty")
+
+    if len(buf) > 500:
+        raise ValueError(f"Sequence too long ({len(buf)} bases). Maximum: 500 bases")
+
+    # Only ACGTacgt remain, so clearing bit 5 uppercases them
+    return buf & 0xDF
+
+
 def validate_sequence(sequence: str) -> str:
     """
     Validate and clean DNA sequence
@@ -148,21 +294,20 @@ def validate_sequence(sequence: str) -> str:
     Raises:
         ValueError: If sequence contains invalid characters
     """
-    # Remove whitespace and convert to uppercase
-    cleaned = sequence.replace('\n', '').replace(' ', '').upper()
+    return _clean_sequence_bytes(sequence).tobytes().decode('ascii')
 
-    # Check for invalid characters
-    valid_bases = set('ACGT')
-    invalid_bases = set(cleaned) - valid_bases
 
-    if invalid_bases:
-        raise ValueError(f"Sequence contains invalid nucleotides: {invalid_bases}")
+def validate_and_encode_sequence(sequence: str) -> np.ndarray:
+    """
+    Validate a DNA sequence and return its integer encoding directly
 
-    # Check length
-    if len(cleaned) == 0:
-        raise ValueError("Sequence is empty")
+    Args:
+        sequence: DNA sequence string
 
-    if len(cleaned) > 500:
-        raise ValueError(f"Sequence too long ({len(cleaned)} bases). Maximum: 500 bases")
+    Returns:
+        uint8 array of indices (A=0, C=1, G=2, T=3)
 
-    return cleaned
+    Raises:
+        ValueError: If sequence contains invalid characters
+    """
+    return _BASE_LUT[_clean_sequence_bytes(sequence)]
@@ -1,66 +1,122 @@
 from __future__ import annotations
+import asyncio
+import base64
+import multiprocessing
 import os
-import random
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated, List, Optional
 from contextlib import asynccontextmanager
 
+import numpy as np
+import orjson
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, ValidationError
 
 from .physioq_encoder import PhysioQEncoder
-from .vqe_alignment import VQEAlignment
+from .vqe_alignment import VQEAlignment, warm_up as warm_up_alignment
 from .qaoa_motif import QAOAMotifFinder
 from .qcnn_variant import QCNNVariantDetector
-from .smith_waterman import SmithWaterman, BlastLike
-from .visualizations import VisualizationGenerator
-from .db import connect_to_mongo, close_mongo_connection, save_run, fetch_runs, get_run_by_id, update_run as db_update_run, delete_run as db_delete_run
+from .smith_waterman import SmithWaterman, BlastLike, warm_up as warm_up_local_alignment
+from .visualizations import VisualizationGenerator, warm_up as warm_up_visualizations
+from .db import connect_to_mongo, close_mongo_connection, start_run_writer, stop_run_writer, queue_run, flush_run_queue, save_runs_bulk, iter_runs, get_run_by_id, update_run as db_update_run, delete_run as db_delete_run
 
 # Import MongoDB operations for datasets and processing jobs
 from .mongo_operations import (
-    save_dataset, get_dataset, list_datasets, delete_dataset,
-    create_processing_job, get_processing_job, list_processing_jobs,
+    save_dataset, get_dataset, iter_dataset_summaries, delete_dataset,
+    create_processing_job, get_processing_job, iter_job_summaries,
     update_processing_job, add_processing_step
 )
 from .models import Dataset, ProcessingJob, ProcessingStatus, AlgorithmType, ProcessingStep
 from .processing_logger import create_job_logger
+from .response_cache import cached, connect_to_redis, close_redis_connection
 
 # Import Viterbi modules (Core QVA functionality)
-from .hmm_models import get_hmm_config, list_available_models
-from .classical_viterbi import run_classical_viterbi
+from .hmm_models import HMMModelName, get_hmm_config, list_available_models
+from .classical_viterbi import run_classical_viterbi, batch_classical_viterbi
 from .qva_viterbi import run_quantum_viterbi, generate_circuit_diagram
 
 load_dotenv()
 
 
+# Worker processes for the CPU-bound batch endpoints (created in lifespan)
+_process_pool: Optional[ProcessPoolExecutor] = None
+_BATCH_CHUNK = 4 * (os.cpu_count() or 1)
+
+
+def _pool_context():
+    """Multiprocessing context for the worker pool
+
+    Where available, workers fork from a forkserver that has already imported
+    this module (and with it numpy, qiskit and the engines), so they neither
+    inherit the server's state nor re-import the stack per process.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return None  # Windows: platform default (spawn)
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["backend.main"])
+    return ctx
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _process_pool
     # Startup
     await connect_to_mongo()
+    start_run_writer()
+    await connect_to_redis()
+    warm_up_visualizations()
+    warm_up_alignment()
+    warm_up_local_alignment()
+    _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_pool_context())
     yield
     # Shutdown
+    _process_pool.shutdown(cancel_futures=True)
+    _process_pool = None
+    await close_redis_connection()
+    await stop_run_writer()
     await close_mongo_connection()
 
 
-app = FastAPI(title="QGENOME API", version="1.1", lifespan=lifespan)
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (FastAPI's own ORJSONResponse is deprecated)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
+
+app = FastAPI(title="QGENOME API", version="1.1", lifespan=lifespan, default_response_class=_ORJSONResponse)
+
+# Explicit CORS_ORIGINS replaces the default of any local dev server on 3000/3001
 cors_origins_env = os.getenv("CORS_ORIGINS")
-origins = [o.strip() for o in cors_origins_env.split(",") if o.strip()] if cors_origins_env else [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    "http://localhost:3001",
-    "http://127.0.0.1:3001",
-]
+origins = [o.strip() for o in cors_origins_env.split(",") if o.strip()] if cors_origins_env else []
+origin_regex = None if cors_origins_env else r"^https?://(localhost|127\.0\.0\.1):(3000|3001)$"
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    allow_origin_regex=origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
 )
 
+# Job, dataset and animation payloads are mostly repeated bases and state labels;
+# responses under 1 KB (health checks, single runs) go out uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Route groups, included into the app at the bottom of this module
+viterbi_router = APIRouter(prefix="/viterbi", tags=["viterbi"])
+dataset_router = APIRouter(prefix="/datasets", tags=["datasets"])
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
 encoder = PhysioQEncoder()
 vqe_engine = VQEAlignment()
 qaoa_engine = QAOAMotifFinder()
@@ -70,33 +126,70 @@ blast_engine = BlastLike()
 viz_generator = VisualizationGenerator()
 
 
+def _align_pair(seq1: str, seq2: str) -> dict:
+    return vqe_engine.align(seq1, seq2)
+
+
+def _find_motif(sequences: List[str], motif_length: int) -> dict:
+    return qaoa_engine.find_motif(sequences, motif_length)
+
+
+async def _run_batch(func, arg_tuples: list) -> list:
+    """Run func over independent inputs in the process pool, preserving order.
+
+    Work is submitted in chunks of _BATCH_CHUNK so huge batches do not queue
+    thousands of futures at once. Without a pool (lifespan not run) the
+    loop's default thread executor is used.
+    """
+    loop = asyncio.get_running_loop()
+    results = []
+    for start in range(0, len(arg_tuples), _BATCH_CHUNK):
+        chunk = arg_tuples[start : start + _BATCH_CHUNK]
+        results.extend(await asyncio.gather(
+            *[loop.run_in_executor(_process_pool, func, *args) for args in chunk]
+        ))
+    return results
+
+
+_SAMPLE_BASES = np.frombuffer(b"ACGT", dtype=np.uint8)
+_SAMPLE_MOTIF = np.frombuffer(b"ATGCGT", dtype=np.uint8)
+_sample_rng = np.random.default_rng()
+
+
 def _generate_sample_sequences(length: int = 80) -> dict:
-    bases = ["A", "C", "G", "T"]
-    motif = "ATGCGT"
+    motif_len = len(_SAMPLE_MOTIF)
     def synth() -> str:
-        start = random.randint(0, length - len(motif))
-        seq = [random.choice(bases) for _ in range(length)]
-        seq[start : start + len(motif)] = list(motif)
-        return "".join(seq)
+        # Draw all bases at once as ASCII bytes, then splice in the motif
+        seq = _SAMPLE_BASES[_sample_rng.integers(0, 4, size=length)]
+        start = int(_sample_rng.integers(0, length - motif_len + 1))
+        seq[start : start + motif_len] = _SAMPLE_MOTIF
+        return seq.tobytes().decode("ascii")
     return {"sequence1": synth(), "sequence2": synth()}
 
 
+# Parse-time caps, so oversized bodies are rejected before any quadratic
+# (alignment) or per-base (quantum) work; the algorithms keep their own limits
+MAX_SEQUENCE_LENGTH = 5000
+MAX_BATCH_ITEMS = 1000
+SequenceStr = Annotated[str, Field(max_length=MAX_SEQUENCE_LENGTH)]
+
+
 class EncodeRequest(BaseModel):
-    sequence: str = Field(..., json_schema_extra={"example": "ATGC"})
+    sequence: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATGC"})
 
 
 class AlignRequest(BaseModel):
-    sequence1: str = Field(..., json_schema_extra={"example": "ATGC"})
-    sequence2: str = Field(..., json_schema_extra={"example": "ATCC"})
+    sequence1: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATGC"})
+    sequence2: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATCC"})
 
 
 class MotifRequest(BaseModel):
-    sequences: List[str]
+    sequences: List[SequenceStr] = Field(..., max_length=MAX_BATCH_ITEMS)
     motif_length: int = 6
 
 
 class VariantRequest(BaseModel):
-    sequence: str
+    sequence: SequenceStr
 
 
 class RunUpdate(BaseModel):
@@ -105,16 +198,16 @@ class RunUpdate(BaseModel):
 
 
 class BatchAlignRequest(BaseModel):
-    sequence_pairs: List[dict] = Field(..., json_schema_extra={"example": [{"seq1": "ATGC", "seq2": "ATCC"}]})
+    sequence_pairs: List[dict] = Field(..., max_length=MAX_BATCH_ITEMS, json_schema_extra={"example": [{"seq1": "ATGC", "seq2": "ATCC"}]})
 
 
 class BatchMotifRequest(BaseModel):
-    sequences_list: List[List[str]] = Field(..., json_schema_extra={"example": [[["ATGC", "ATCC"], ["ATGC", "ATCC"]]]})
+    sequences_list: List[List[SequenceStr]] = Field(..., max_length=MAX_BATCH_ITEMS, json_schema_extra={"example": [[["ATGC", "ATCC"], ["ATGC", "ATCC"]]]})
     motif_length: int = 6
 
 
 class VisualizationRequest(BaseModel):
-    sequence: str
+    sequence: SequenceStr
     type: str = Field(..., json_schema_extra={"example": "helix"})  # helix, circuit, alignment
 
 
@@ -135,26 +228,79 @@ class ProcessingJobCreateRequest(BaseModel):
 
 # Viterbi-specific request models
 class ViterbiRequest(BaseModel):
-    sequence: str = Field(..., json_schema_extra={"example": "ATGCCTACGCATGCTA"}, description="DNA sequence (A, C, G, T only)")
-    hmm_model: str = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"}, description="HMM model to use")
+    sequence: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATGCCTACGCATGCTA"}, description="DNA sequence (A, C, G, T only)")
+    hmm_model: HMMModelName = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"}, description="HMM model to use")
     shots: int = Field(default=1024, json_schema_extra={"example": 1024}, description="Number of quantum shots (quantum only)")
     save_to_db: bool = Field(default=False, description="Save processing details to database")
 
 
+class BatchViterbiRequest(BaseModel):
+    sequences: List[SequenceStr] = Field(..., max_length=MAX_BATCH_ITEMS, json_schema_extra={"example": ["ATGCCTACGCATGCTA", "GCGCATATGCGC"]})
+    hmm_model: HMMModelName = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"})
+
+
 class CircuitDiagramRequest(BaseModel):
-    sequence: str = Field(..., json_schema_extra={"example": "ATGCCTACGCATGCTA"})
-    hmm_model: str = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"})
+    sequence: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATGCCTACGCATGCTA"})
+    hmm_model: HMMModelName = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"})
     time_step: int = Field(default=0, json_schema_extra={"example": 0}, description="Which time step to visualize")
 
 
 class ViterbiAnimationRequest(BaseModel):
-    sequence: str = Field(..., json_schema_extra={"example": "ATGCCTACGCATGCTA"})
-    hmm_model: str = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"})
+    sequence: str = Field(..., max_length=MAX_SEQUENCE_LENGTH, json_schema_extra={"example": "ATGCCTACGCATGCTA"})
+    hmm_model: HMMModelName = Field(default="2-state-exon-intron", json_schema_extra={"example": "2-state-exon-intron"})
+
+
+def _json_body(model: type[BaseModel]):
+    """Dependency that decodes and validates a JSON body in one pydantic-core pass.
+
+    FastAPI's own body handling runs json.loads and then validates the dict;
+    model_validate_json skips the intermediate Python objects. Errors keep
+    FastAPI's 422 shape with a "body" location prefix.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+            )
+    return parse
+
+
+def _body_schema(model: type[BaseModel]) -> dict:
+    """openapi_extra documenting a body parsed by _json_body"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
+
+
+async def _json_array_stream(first, records):
+    """Encode first and the rest of an async iterable of dicts as a JSON array, one element at a time"""
+    yield b"[" + orjson.dumps(first)
+    async for record in records:
+        yield b"," + orjson.dumps(record)
+    yield b"]"
+
+
+async def _stream_list(records) -> Response:
+    """Stream a list response while the Mongo cursor is still being read
+
+    The first record is fetched before responding, so a failing query (or a
+    missing connection) raises in the endpoint and becomes an error status
+    instead of a truncated 200 body.
+    """
+    try:
+        first = await anext(records)
+    except StopAsyncIteration:
+        return Response(content=b"[]", media_type="application/json")
+    return StreamingResponse(_json_array_stream(first, records), media_type="application/json")
+
+
+# Static payloads are serialized once and served as raw bytes
+_HEALTH_BODY = orjson.dumps({"status": "ok"})
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/samples")
@@ -163,20 +309,12 @@ def samples():
 
 
 @app.get("/runs")
-async def get_runs(limit: int = 10, run_type: Optional[str] = None):
-    runs = await fetch_runs(run_type=run_type, limit=min(limit, 50))
-    return [
-        {
-            "id": run.id,
-            "run_type": run.run_type,
-            "sequence_a": run.sequence_a,
-            "sequence_b": run.sequence_b,
-            "score": run.score,
-            "created_at": run.created_at.isoformat(),
-            "result": run.result,  # Already a dict, no json.loads needed
-        }
-        for run in runs
-    ]
+async def get_runs(limit: int = 10, run_type: Optional[str] = None, summary: bool = False):
+    # Runs queued by just-answered requests are written before listing
+    await flush_run_queue()
+    runs = iter_runs(run_type=run_type, limit=min(limit, 50), summary=summary)
+    # result is None for summary listings; datetimes become ISO strings
+    return await _stream_list(run.model_dump(mode="json") async for run in runs)
 
 
 @app.delete("/runs/{run_id}")
@@ -199,8 +337,9 @@ async def update_run_endpoint(run_id: str, payload: RunUpdate):
     }
 
 
-@app.post("/encode")
-def encode(req: EncodeRequest):
+@app.post("/encode", openapi_extra=_body_schema(EncodeRequest))
+@cached("encode")
+def encode(req: EncodeRequest = Depends(_json_body(EncodeRequest))):
     try:
         ops, qubits = encoder.encode_sequence(req.sequence)
         return {"operations": ops, "qubits": qubits}
@@ -208,8 +347,8 @@ def encode(req: EncodeRequest):
         raise HTTPException(status_code=400, detail=str(exc))
 
 
-@app.post("/align")
-async def align(req: AlignRequest):
+@app.post("/align", openapi_extra=_body_schema(AlignRequest))
+async def align(req: AlignRequest = Depends(_json_body(AlignRequest))):
     """
     Align two sequences using VQE algorithm with optional processing logging
     """
@@ -220,34 +359,37 @@ async def align(req: AlignRequest):
         # Start processing
         logger.start_step("Input Validation", {"seq1_length": len(req.sequence1), "seq2_length": len(req.sequence2)})
         
-        # Create processing job in database (if needed for tracking)
+        # Create the job already running, so no separate status write is needed
         job = await create_processing_job(
             job_name=f"VQE Alignment: {req.sequence1[:10]}... vs {req.sequence2[:10]}...",
             algorithm=AlgorithmType.VQE_ALIGNMENT,
             input_sequences=[req.sequence1, req.sequence2],
-            input_parameters={}
+            input_parameters={},
+            status=ProcessingStatus.RUNNING
         )
         job_id = job.id
         
-        await update_processing_job(job_id, status=ProcessingStatus.RUNNING)
         logger.end_step("completed", {"job_id": job_id})
         
         # Run alignment
         logger.start_step("VQE Circuit Construction")
-        result = vqe_engine.align(req.sequence1, req.sequence2)
+        # Off the event loop, so other requests are served while the circuit runs
+        result = await asyncio.get_running_loop().run_in_executor(
+            None, vqe_engine.align, req.sequence1, req.sequence2
+        )
         logger.end_step("completed", {"alignment_score": result.get("alignment_score")})
         
-        # Save to database
+        # Save the run and complete the job concurrently
         logger.start_step("Database Storage")
-        await save_run("align", req.sequence1, req.sequence2, result["alignment_score"], result)
-        
-        # Update job with results
-        await update_processing_job(
-            job_id,
-            status=ProcessingStatus.COMPLETED,
-            result=result,
-            score=result["alignment_score"],
-            processing_steps=logger.get_steps()
+        await asyncio.gather(
+            queue_run("align", req.sequence1, req.sequence2, result["alignment_score"], result),
+            update_processing_job(
+                job_id,
+                status=ProcessingStatus.COMPLETED,
+                result=result,
+                score=result["alignment_score"],
+                processing_steps=logger.get_steps()
+            )
         )
         logger.end_step("completed")
         
@@ -271,7 +413,7 @@ async def align(req: AlignRequest):
 async def find_motifs(req: MotifRequest):
     try:
         result = qaoa_engine.find_motif(req.sequences, req.motif_length)
-        await save_run("motif", req.sequences[0], req.sequences[1] if len(req.sequences) > 1 else None, result["score"], result)
+        await queue_run("motif", req.sequences[0], req.sequences[1] if len(req.sequences) > 1 else None, result["score"], result)
         return {"algorithm": "QAOA", "results": result}
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -281,14 +423,15 @@ async def find_motifs(req: MotifRequest):
 async def detect_variant(req: VariantRequest):
     try:
         result = qcnn_engine.predict(req.sequence)
-        await save_run("variant", req.sequence, None, result["pathogenic_probability"], result)
+        await queue_run("variant", req.sequence, None, result["pathogenic_probability"], result)
         return {"algorithm": "QCNN", "results": result}
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
-@app.post("/smith-waterman")
-def sw_align(req: AlignRequest):
+@app.post("/smith-waterman", openapi_extra=_body_schema(AlignRequest))
+@cached("smith-waterman")
+def sw_align(req: AlignRequest = Depends(_json_body(AlignRequest))):
     try:
         result = smith_waterman.align(req.sequence1, req.sequence2)
         return {"algorithm": "Smith-Waterman", "results": result}
@@ -297,6 +440,7 @@ def sw_align(req: AlignRequest):
 
 
 @app.post("/blast-search")
+@cached("blast-search")
 def blast_search(req: MotifRequest):
     try:
         if len(req.sequences) < 2:
@@ -310,24 +454,31 @@ def blast_search(req: MotifRequest):
 
 
 @app.post("/batch-align")
-def batch_align(req: BatchAlignRequest):
+async def batch_align(req: BatchAlignRequest):
     try:
-        results = []
-        for pair in req.sequence_pairs:
-            result = vqe_engine.align(pair["seq1"], pair["seq2"])
-            results.append(result)
+        pairs = [(pair["seq1"], pair["seq2"]) for pair in req.sequence_pairs]
+        results = await _run_batch(_align_pair, pairs)
+        await save_runs_bulk([
+            {"run_type": "align", "sequence_a": seq1, "sequence_b": seq2,
+             "score": result["alignment_score"], "result": result}
+            for (seq1, seq2), result in zip(pairs, results)
+        ])
         return {"algorithm": "VQE-Batch", "total": len(results), "results": results}
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
 @app.post("/batch-motif")
-def batch_motif(req: BatchMotifRequest):
+async def batch_motif(req: BatchMotifRequest):
     try:
-        results = []
-        for seq_list in req.sequences_list:
-            result = qaoa_engine.find_motif(seq_list, req.motif_length)
-            results.append(result)
+        jobs = [(seq_list, req.motif_length) for seq_list in req.sequences_list]
+        results = await _run_batch(_find_motif, jobs)
+        await save_runs_bulk([
+            {"run_type": "motif", "sequence_a": seq_list[0],
+             "sequence_b": seq_list[1] if len(seq_list) > 1 else None,
+             "score": result["score"], "result": result}
+            for (seq_list, _), result in zip(jobs, results)
+        ])
         return {"algorithm": "QAOA-Batch", "total": len(results), "results": results}
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -337,6 +488,42 @@ def batch_motif(req: BatchMotifRequest):
 # VITERBI ALGORITHM ENDPOINTS (Core QGENOME QVA Functionality)
 # ============================================================================
 
+# HMM models are static configuration, so the listing never changes
+_available_models = list_available_models()
+_HMM_MODELS_BODY = orjson.dumps({"models": _available_models, "total": len(_available_models)})
+
+
+# Recently decoded QVA paths by (hmm_model, sequence), so the animation of a
+# sequence just decoded by /viterbi/quantum or /viterbi/compare is not re-simulated
+_QVA_PATH_TTL = 600  # Seconds
+_QVA_PATH_CACHE_SIZE = 256
+_qva_path_cache: OrderedDict = OrderedDict()
+# The sync animation endpoint uses the cache from the threadpool
+_qva_path_lock = threading.Lock()
+
+
+def _remember_qva_path(hmm_model: str, sequence: str, decoded_path: str):
+    key = (hmm_model, sequence.strip().upper())
+    with _qva_path_lock:
+        _qva_path_cache[key] = (time.monotonic() + _QVA_PATH_TTL, decoded_path)
+        _qva_path_cache.move_to_end(key)
+        if len(_qva_path_cache) > _QVA_PATH_CACHE_SIZE:
+            _qva_path_cache.popitem(last=False)
+
+
+def _recall_qva_path(hmm_model: str, sequence: str) -> Optional[str]:
+    key = (hmm_model, sequence.strip().upper())
+    with _qva_path_lock:
+        entry = _qva_path_cache.get(key)
+        if entry is None:
+            return None
+        expires, decoded_path = entry
+        if expires < time.monotonic():
+            _qva_path_cache.pop(key, None)
+            return None
+        return decoded_path
+
+
 @app.get("/hmm/models")
 def get_hmm_models():
     """
@@ -345,15 +532,11 @@ def get_hmm_models():
     Returns:
         List of HMM model configurations
     """
-    try:
-        models = list_available_models()
-        return {"models": models, "total": len(models)}
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
+    return Response(content=_HMM_MODELS_BODY, media_type="application/json")
 
 
-@app.post("/viterbi/quantum")
-async def quantum_viterbi(req: ViterbiRequest):
+@viterbi_router.post("/quantum", openapi_extra=_body_schema(ViterbiRequest))
+async def quantum_viterbi(req: ViterbiRequest = Depends(_json_body(ViterbiRequest))):
     """
     Run Quantum Viterbi Algorithm (QVA) for DNA sequence decoding
 
@@ -371,9 +554,10 @@ async def quantum_viterbi(req: ViterbiRequest):
 
         # Run Quantum Viterbi
         result = run_quantum_viterbi(req.sequence, hmm_config, shots=req.shots)
+        _remember_qva_path(req.hmm_model, req.sequence, result['decoded_path_string'])
 
         # Save to database
-        await save_run(
+        await queue_run(
             "viterbi_quantum",
             req.sequence,
             None,
@@ -392,12 +576,12 @@ async def quantum_viterbi(req: ViterbiRequest):
         raise HTTPException(status_code=500, detail=f"QVA execution failed: {str(exc)}")
 
 
-@app.post("/viterbi/classical")
-async def classical_viterbi(req: ViterbiRequest):
+@viterbi_router.post("/classical", openapi_extra=_body_schema(ViterbiRequest))
+async def classical_viterbi(req: ViterbiRequest = Depends(_json_body(ViterbiRequest))):
     """
     Run Classical Viterbi Algorithm for baseline comparison
 
-    Uses hmmlearn library for standard dynamic programming approach
+    Uses a compiled log-space dynamic programming decoder
 
     Args:
         req: ViterbiRequest with sequence and hmm_model
@@ -413,7 +597,7 @@ async def classical_viterbi(req: ViterbiRequest):
         result = run_classical_viterbi(req.sequence, hmm_config)
 
         # Save to database
-        await save_run(
+        await queue_run(
             "viterbi_classical",
             req.sequence,
             None,
@@ -422,7 +606,7 @@ async def classical_viterbi(req: ViterbiRequest):
         )
 
         return {
-            "algorithm": "Classical Viterbi (hmmlearn)",
+            "algorithm": "Classical Viterbi (Dynamic Programming)",
             "hmm_model": req.hmm_model,
             "results": result
         }
@@ -437,8 +621,47 @@ async def classical_viterbi(req: ViterbiRequest):
         raise HTTPException(status_code=500, detail=f"Classical Viterbi failed: {str(exc)}")
 
 
-@app.post("/viterbi/compare")
-async def compare_viterbi(req: ViterbiRequest):
+@viterbi_router.post("/classical/batch")
+async def classical_viterbi_batch(req: BatchViterbiRequest):
+    """
+    Run Classical Viterbi on many sequences in one decoder call
+
+    Args:
+        req: BatchViterbiRequest with sequences and hmm_model
+
+    Returns:
+        Per-sequence results; invalid sequences carry an error entry
+    """
+    try:
+        hmm_config = get_hmm_config(req.hmm_model)
+        results = batch_classical_viterbi(req.sequences, hmm_config)
+
+        # Persist every decoded sequence with a single insert
+        await save_runs_bulk([
+            {
+                "run_type": "viterbi_classical",
+                "sequence_a": req.sequences[result['sequence_id']],
+                "sequence_b": None,
+                "score": result['log_probability'],
+                "result": result
+            }
+            for result in results if 'error' not in result
+        ])
+
+        return {
+            "algorithm": "Classical Viterbi (Dynamic Programming)",
+            "hmm_model": req.hmm_model,
+            "total": len(results),
+            "results": results
+        }
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Classical Viterbi batch failed: {str(exc)}")
+
+
+@viterbi_router.post("/compare", openapi_extra=_body_schema(ViterbiRequest))
+async def compare_viterbi(req: ViterbiRequest = Depends(_json_body(ViterbiRequest))):
     """
     Run both Quantum and Classical Viterbi for direct comparison
 
@@ -452,15 +675,19 @@ async def compare_viterbi(req: ViterbiRequest):
         # Get HMM configuration
         hmm_config = get_hmm_config(req.hmm_model)
 
-        # Run both methods
-        quantum_result = run_quantum_viterbi(req.sequence, hmm_config, shots=req.shots)
-        classical_result = run_classical_viterbi(req.sequence, hmm_config)
-
-        # Calculate agreement
-        agreement = sum(
-            1 for q, c in zip(quantum_result['decoded_path'], classical_result['decoded_path'])
-            if q == c
+        # The two decoders are independent, so run them side by side in the pool
+        loop = asyncio.get_running_loop()
+        quantum_result, classical_result = await asyncio.gather(
+            loop.run_in_executor(_process_pool, run_quantum_viterbi, req.sequence, hmm_config, req.shots),
+            loop.run_in_executor(_process_pool, run_classical_viterbi, req.sequence, hmm_config),
         )
+        _remember_qva_path(req.hmm_model, req.sequence, quantum_result['decoded_path_string'])
+
+        # Calculate agreement with one byte-wise compare (state labels are single ASCII chars)
+        q_path = np.frombuffer(quantum_result['decoded_path_string'].encode('ascii'), dtype=np.uint8)
+        c_path = np.frombuffer(classical_result['decoded_path_string'].encode('ascii'), dtype=np.uint8)
+        n_common = min(len(q_path), len(c_path))
+        agreement = int(np.count_nonzero(q_path[:n_common] == c_path[:n_common]))
         agreement_percent = (agreement / len(quantum_result['decoded_path'])) * 100
 
         return {
@@ -483,7 +710,7 @@ async def compare_viterbi(req: ViterbiRequest):
         raise HTTPException(status_code=500, detail=f"Comparison failed: {str(exc)}")
 
 
-@app.post("/viterbi/circuit-diagram")
+@viterbi_router.post("/circuit-diagram")
 def get_circuit_diagram(req: CircuitDiagramRequest):
     """
     Generate quantum circuit diagram for visualization
@@ -509,7 +736,30 @@ def get_circuit_diagram(req: CircuitDiagramRequest):
         raise HTTPException(status_code=500, detail=f"Circuit diagram generation failed: {str(exc)}")
 
 
-@app.post("/viterbi/animation-frames")
+# State color mapping for visualization, indexed by the label's ASCII code
+_STATE_COLOR_LUT = np.full(256, "#4CAF50", dtype=object)  # Default - Green
+_STATE_COLOR_LUT[ord("E")] = "#4CAF50"  # Exon - Green
+_STATE_COLOR_LUT[ord("I")] = "#FF9800"  # Intron - Orange
+_STATE_COLOR_LUT[ord("P")] = "#2196F3"  # Promoter - Blue
+
+
+def _pack_states(path: str, states: List[str]) -> str:
+    """Base64 of the path as 2-bit state indices, four per byte, first state in the low bits.
+
+    Index i refers to states[i]. The last byte is zero-padded, so clients need
+    the number of positions, len(path) (sent as total_steps), to drop the
+    padding codes. Models have at most four states, so two bits always suffice.
+    """
+    lut = np.zeros(256, dtype=np.uint8)
+    for idx, label in enumerate(states):
+        lut[ord(label)] = idx
+    codes = lut[np.frombuffer(path.encode("ascii"), dtype=np.uint8)]
+    codes = np.pad(codes, (0, -len(codes) % 4)).reshape(-1, 4)
+    packed = codes[:, 0] | (codes[:, 1] << 2) | (codes[:, 2] << 4) | (codes[:, 3] << 6)
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+@viterbi_router.post("/animation-frames")
 def get_animation_frames(req: ViterbiAnimationRequest):
     """
     Generate frame-by-frame animation data for Viterbi decoding visualization
@@ -525,36 +775,41 @@ def get_animation_frames(req: ViterbiAnimationRequest):
         sequence = encoder.validate(req.sequence)
         hmm_config = get_hmm_config(req.hmm_model)
 
-        # State color mapping for visualization
-        state_colors = {
-            "E": "#4CAF50",  # Exon - Green
-            "I": "#FF9800",  # Intron - Orange
-            "P": "#2196F3",  # Promoter - Blue
-        }
-
-        # Run Viterbi algorithm and collect frames
-        result = run_quantum_viterbi(sequence, hmm_config, shots=1024)
-        
-        # Handle result structure - check for decoded_path in various locations
-        decoded_path = result.get("results", {}).get("decoded_path") or result.get("decoded_path") or ""
+        # Reuse a recent decode of this sequence, else run the Viterbi algorithm
+        decoded_path = _recall_qva_path(req.hmm_model, sequence)
+        if decoded_path is None:
+            result = run_quantum_viterbi(sequence, hmm_config, shots=1024)
+            
+            # Handle result structure - check for decoded_path in various locations
+            decoded_path = result.get("results", {}).get("decoded_path") or result.get("decoded_path") or ""
+            if decoded_path:
+                _remember_qva_path(req.hmm_model, sequence, "".join(decoded_path))
         if not decoded_path:
             # Fallback: generate default path if decoding failed
             decoded_path = "E" * len(sequence)
 
-        # Generate animation frames
-        frames = []
-        for time_step in range(len(sequence)):
-            state = decoded_path[time_step] if time_step < len(decoded_path) else "E"
-            frames.append({
+        # One state per base (padded with "E"), colored with a single gather;
+        # the full path is sent once instead of as a growing prefix per frame
+        n_steps = len(sequence)
+        path = "".join(decoded_path)[:n_steps].ljust(n_steps, "E")
+        colors = _STATE_COLOR_LUT[np.frombuffer(path.encode("ascii"), dtype=np.uint8)].tolist()
+
+        frames = [
+            {
                 "step": time_step,
-                "current_base": sequence[time_step],
+                "current_base": base,
                 "decoded_state": state,
-                "state_color": state_colors.get(state, "#4CAF50"),
-                "cumulative_path": decoded_path[:time_step + 1]
-            })
+                "state_color": color,
+                # Length of the decoded prefix at this step, for clients that replay it
+                "cumulative_end": time_step + 1,
+            }
+            for time_step, base, state, color in zip(range(n_steps), sequence, path, colors)
+        ]
 
         return {
             "frames": frames,
+            "decoded_path_packed": _pack_states(path, hmm_config["states"]),
+            "states": hmm_config["states"],
             "total_steps": len(sequence),
             "hmm_model": req.hmm_model,
             "sequence_length": len(sequence)
@@ -571,7 +826,16 @@ def get_animation_frames(req: ViterbiAnimationRequest):
 # DATASET MANAGEMENT ENDPOINTS
 # ============================================================================
 
-@app.post("/datasets")
+# Fields exposed by the dataset and job endpoints; model_dump(mode="json")
+# serializes them (datetimes, enums) in pydantic-core
+_DATASET_DETAIL_FIELDS = {"id", "name", "description", "sequences", "tags", "created_at", "updated_at"}
+_JOB_SUMMARY_FIELDS = {"id", "job_name", "algorithm", "status", "score", "created_at", "started_at", "completed_at"}
+_JOB_DETAIL_FIELDS = _JOB_SUMMARY_FIELDS | {
+    "input_sequences", "input_parameters", "processing_steps", "result", "error_message"
+}
+
+
+@dataset_router.post("")
 async def create_dataset(req: DatasetCreateRequest):
     """Create a new dataset in MongoDB"""
     try:
@@ -595,29 +859,30 @@ async def create_dataset(req: DatasetCreateRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create dataset: {str(exc)}")
 
 
-@app.get("/datasets")
+@dataset_router.get("")
 async def get_datasets(limit: int = 50, skip: int = 0):
     """List all datasets"""
     try:
-        datasets = await list_datasets(limit=limit, skip=skip)
+        datasets = iter_dataset_summaries(limit=limit, skip=skip)
         
-        return [
+        # orjson writes the datetimes natively, in the same ISO form
+        return await _stream_list(
             {
-                "id": ds.id,
-                "name": ds.name,
-                "description": ds.description,
-                "sequences_count": len(ds.sequences),
-                "tags": ds.tags,
-                "created_at": ds.created_at.isoformat(),
-                "updated_at": ds.updated_at.isoformat()
+                "id": ds["id"],
+                "name": ds["name"],
+                "description": ds.get("description"),
+                "sequences_count": ds["sequences_count"],
+                "tags": ds.get("tags", []),
+                "created_at": ds["created_at"],
+                "updated_at": ds["updated_at"]
             }
-            for ds in datasets
-        ]
+            async for ds in datasets
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to fetch datasets: {str(exc)}")
 
 
-@app.get("/datasets/{dataset_id}")
+@dataset_router.get("/{dataset_id}")
 async def get_dataset_detail(dataset_id: str):
     """Get dataset details"""
     try:
@@ -626,22 +891,14 @@ async def get_dataset_detail(dataset_id: str):
         if not dataset:
             raise HTTPException(status_code=404, detail="Dataset not found")
         
-        return {
-            "id": dataset.id,
-            "name": dataset.name,
-            "description": dataset.description,
-            "sequences": dataset.sequences,
-            "tags": dataset.tags,
-            "created_at": dataset.created_at.isoformat(),
-            "updated_at": dataset.updated_at.isoformat()
-        }
+        return dataset.model_dump(mode="json", include=_DATASET_DETAIL_FIELDS)
     except HTTPException:
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to fetch dataset: {str(exc)}")
 
 
-@app.delete("/datasets/{dataset_id}")
+@dataset_router.delete("/{dataset_id}")
 async def delete_dataset_endpoint(dataset_id: str):
     """Delete a dataset"""
     try:
@@ -661,7 +918,7 @@ async def delete_dataset_endpoint(dataset_id: str):
 # PROCESSING JOB ENDPOINTS
 # ============================================================================
 
-@app.post("/jobs")
+@jobs_router.post("")
 async def create_job(req: ProcessingJobCreateRequest):
     """Create a new processing job"""
     try:
@@ -683,32 +940,33 @@ async def create_job(req: ProcessingJobCreateRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create job: {str(exc)}")
 
 
-@app.get("/jobs")
+@jobs_router.get("")
 async def get_jobs(status: Optional[str] = None, algorithm: Optional[str] = None, limit: int = 50):
     """List processing jobs"""
     try:
         status_filter = ProcessingStatus(status) if status else None
-        jobs = await list_processing_jobs(status=status_filter, algorithm=algorithm, limit=limit)
+        jobs = iter_job_summaries(status=status_filter, algorithm=algorithm, limit=limit)
         
-        return [
+        # Inputs, steps and results stay in the database until /jobs/{id}
+        return await _stream_list(
             {
-                "id": job.id,
-                "job_name": job.job_name,
-                "algorithm": job.algorithm,
-                "status": job.status,
-                "score": job.score,
-                "created_at": job.created_at.isoformat(),
-                "started_at": job.started_at.isoformat() if job.started_at else None,
-                "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                "processing_steps_count": len(job.processing_steps)
+                "id": job["id"],
+                "job_name": job["job_name"],
+                "algorithm": job["algorithm"],
+                "status": job["status"],
+                "score": job.get("score"),
+                "created_at": job["created_at"],
+                "started_at": job.get("started_at"),
+                "completed_at": job.get("completed_at"),
+                "processing_steps_count": job["processing_steps_count"]
             }
-            for job in jobs
-        ]
+            async for job in jobs
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to fetch jobs: {str(exc)}")
 
 
-@app.get("/jobs/{job_id}")
+@jobs_router.get("/{job_id}")
 async def get_job_detail(job_id: str):
     """Get job details including processing steps"""
     try:
@@ -717,30 +975,7 @@ async def get_job_detail(job_id: str):
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return {
-            "id": job.id,
-            "job_name": job.job_name,
-            "algorithm": job.algorithm,
-            "status": job.status,
-            "input_sequences": job.input_sequences,
-            "input_parameters": job.input_parameters,
-            "processing_steps": [
-                {
-                    "step_name": step.step_name,
-                    "timestamp": step.timestamp.isoformat(),
-                    "duration_ms": step.duration_ms,
-                    "status": step.status,
-                    "details": step.details
-                }
-                for step in job.processing_steps
-            ],
-            "result": job.result,
-            "score": job.score,
-            "error_message": job.error_message,
-            "created_at": job.created_at.isoformat(),
-            "started_at": job.started_at.isoformat() if job.started_at else None,
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None
-        }
+        return job.model_dump(mode="json", include=_JOB_DETAIL_FIELDS)
     except HTTPException:
         raise
     except Exception as exc:
@@ -767,7 +1002,22 @@ def visualize(req: VisualizationRequest):
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+app.include_router(viterbi_router)
+app.include_router(dataset_router)
+app.include_router(jobs_router)
+
+
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("API_PORT", 8000)))
+    # uvicorn[standard] ships uvloop and httptools everywhere but Windows; each
+    # worker opens its own Mongo client and process pool, so scale with API_WORKERS
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("API_PORT", 8000)),
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        workers=int(os.getenv("API_WORKERS") or os.getenv("WEB_CONCURRENCY") or 1),
+    )
@@ -33,9 +33,6 @@ class ProcessingStep(BaseModel):
     duration_ms: Optional[float] = None
     details: Dict[str, Any] = Field(default_factory=dict)
     status: str = "completed"
-    
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
 
 
 class Dataset(BaseModel):
@@ -48,9 +45,6 @@ class Dataset(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     tags: List[str] = Field(default_factory=list)
-    
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
 
 
 class ProcessingJob(BaseModel):
@@ -81,9 +75,6 @@ class ProcessingJob(BaseModel):
     quantum_circuit_depth: Optional[int] = None
     quantum_shots: Optional[int] = None
     backend_name: Optional[str] = None
-    
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
 
 
 class SequenceAnalysis(BaseModel):
@@ -94,6 +85,3 @@ class SequenceAnalysis(BaseModel):
     gc_content: Optional[float] = None
     analysis_results: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
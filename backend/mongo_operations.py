@@ -3,9 +3,10 @@ Enhanced MongoDB operations with datasets and processing logs
 """
 from __future__ import annotations
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
 from .db import get_database
 from .models import Dataset, ProcessingJob, SequenceAnalysis, ProcessingStatus, ProcessingStep
@@ -22,7 +23,7 @@ async def save_dataset(dataset: Dataset) -> Dataset:
     db = get_database()
     collection = db[DATASETS_COLLECTION]
     
-    doc = dataset.dict(exclude={"id"})
+    doc = dataset.model_dump(exclude={"id"})
     doc["created_at"] = datetime.utcnow()
     doc["updated_at"] = datetime.utcnow()
     
@@ -52,14 +53,50 @@ async def list_datasets(limit: int = 50, skip: int = 0) -> List[Dataset]:
     db = get_database()
     collection = db[DATASETS_COLLECTION]
     
-    cursor = collection.find().sort("created_at", -1).skip(skip).limit(limit)
-    datasets = []
+    docs = await collection.find().sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
     
-    async for doc in cursor:
+    # Documents were validated on the way in, so skip re-validation
+    for doc in docs:
         doc["id"] = str(doc.pop("_id"))
-        datasets.append(Dataset(**doc))
+    return [Dataset.model_construct(**doc) for doc in docs]
+
+
+def _dataset_summary_pipeline(limit: int, skip: int) -> List[Dict[str, Any]]:
+    """Aggregation listing datasets without their sequences, counting them on the server"""
+    return [
+        {"$sort": {"created_at": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": {
+            "name": 1,
+            "description": 1,
+            "tags": 1,
+            "created_at": 1,
+            "updated_at": 1,
+            "sequences_count": {"$size": {"$ifNull": ["$sequences", []]}},
+        }},
+    ]
+
+
+async def list_dataset_summaries(limit: int = 50, skip: int = 0) -> List[Dict[str, Any]]:
+    """List datasets without their sequences, counting them on the server"""
+    db = get_database()
+    collection = db[DATASETS_COLLECTION]
+    
+    docs = await collection.aggregate(_dataset_summary_pipeline(limit, skip)).to_list(length=limit)
+    for doc in docs:
+        doc["id"] = str(doc.pop("_id"))
+    return docs
+
+
+async def iter_dataset_summaries(limit: int = 50, skip: int = 0) -> AsyncIterator[Dict[str, Any]]:
+    """Yield dataset summaries one at a time as the aggregation delivers them"""
+    db = get_database()
+    collection = db[DATASETS_COLLECTION]
     
-    return datasets
+    async for doc in collection.aggregate(_dataset_summary_pipeline(limit, skip)):
+        doc["id"] = str(doc.pop("_id"))
+        yield doc
 
 
 async def delete_dataset(dataset_id: str) -> bool:
@@ -78,9 +115,10 @@ async def create_processing_job(
     job_name: str,
     algorithm: str,
     input_sequences: List[str],
-    input_parameters: Dict[str, Any] = None
+    input_parameters: Dict[str, Any] = None,
+    status: ProcessingStatus = ProcessingStatus.PENDING
 ) -> ProcessingJob:
-    """Create a new processing job"""
+    """Create a new processing job (pass RUNNING to start it in the same write)"""
     db = get_database()
     collection = db[PROCESSING_JOBS_COLLECTION]
     
@@ -89,10 +127,11 @@ async def create_processing_job(
         algorithm=algorithm,
         input_sequences=input_sequences,
         input_parameters=input_parameters or {},
-        status=ProcessingStatus.PENDING
+        status=status,
+        started_at=datetime.utcnow() if status == ProcessingStatus.RUNNING else None
     )
     
-    doc = job.dict(exclude={"id"})
+    doc = job.model_dump(exclude={"id"})
     result = await collection.insert_one(doc)
     job.id = str(result.inserted_id)
     
@@ -127,16 +166,21 @@ async def update_processing_job(
     if error_message is not None:
         update_doc["error_message"] = error_message
     if processing_steps is not None:
-        update_doc["processing_steps"] = [step.dict() for step in processing_steps]
+        update_doc["processing_steps"] = [step.model_dump() for step in processing_steps]
     
     try:
-        await collection.update_one(
+        # Update and read back in a single round trip
+        doc = await collection.find_one_and_update(
             {"_id": ObjectId(job_id)},
-            {"$set": update_doc}
+            {"$set": update_doc},
+            return_document=ReturnDocument.AFTER
         )
-        return await get_processing_job(job_id)
+        if doc:
+            doc["id"] = str(doc.pop("_id"))
+            return ProcessingJob(**doc)
     except Exception:
-        return None
+        pass
+    return None
 
 
 async def add_processing_step(job_id: str, step: ProcessingStep) -> bool:
@@ -147,7 +191,7 @@ async def add_processing_step(job_id: str, step: ProcessingStep) -> bool:
     try:
         await collection.update_one(
             {"_id": ObjectId(job_id)},
-            {"$push": {"processing_steps": step.dict()}}
+            {"$push": {"processing_steps": step.model_dump()}}
         )
         return True
     except Exception:
@@ -169,6 +213,16 @@ async def get_processing_job(job_id: str) -> Optional[ProcessingJob]:
     return None
 
 
+def _job_query(status: Optional[ProcessingStatus], algorithm: Optional[str]) -> Dict[str, Any]:
+    """Filter for the job listings"""
+    query = {}
+    if status:
+        query["status"] = status
+    if algorithm:
+        query["algorithm"] = algorithm
+    return query
+
+
 async def list_processing_jobs(
     status: Optional[ProcessingStatus] = None,
     algorithm: Optional[str] = None,
@@ -178,28 +232,51 @@ async def list_processing_jobs(
     db = get_database()
     collection = db[PROCESSING_JOBS_COLLECTION]
     
-    query = {}
-    if status:
-        query["status"] = status
-    if algorithm:
-        query["algorithm"] = algorithm
+    docs = await collection.find(_job_query(status, algorithm)).sort("created_at", -1).limit(limit).to_list(length=limit)
     
-    cursor = collection.find(query).sort("created_at", -1).limit(limit)
+    # Validated (not constructed) so nested processing steps become models
     jobs = []
-    
-    async for doc in cursor:
+    for doc in docs:
         doc["id"] = str(doc.pop("_id"))
         jobs.append(ProcessingJob(**doc))
-    
     return jobs
 
 
+async def iter_job_summaries(
+    status: Optional[ProcessingStatus] = None,
+    algorithm: Optional[str] = None,
+    limit: int = 50
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield job summaries without inputs, steps or results, counting steps on the server"""
+    db = get_database()
+    collection = db[PROCESSING_JOBS_COLLECTION]
+    
+    pipeline = [
+        {"$match": _job_query(status, algorithm)},
+        {"$sort": {"created_at": -1}},
+        {"$limit": limit},
+        {"$project": {
+            "job_name": 1,
+            "algorithm": 1,
+            "status": 1,
+            "score": 1,
+            "created_at": 1,
+            "started_at": 1,
+            "completed_at": 1,
+            "processing_steps_count": {"$size": {"$ifNull": ["$processing_steps", []]}},
+        }},
+    ]
+    async for doc in collection.aggregate(pipeline):
+        doc["id"] = str(doc.pop("_id"))
+        yield doc
+
+
 async def save_sequence_analysis(analysis: SequenceAnalysis) -> SequenceAnalysis:
     """Save sequence analysis result"""
     db = get_database()
     collection = db[SEQUENCE_ANALYSIS_COLLECTION]
     
-    doc = analysis.dict(exclude={"id"})
+    doc = analysis.model_dump(exclude={"id"})
     doc["created_at"] = datetime.utcnow()
     
     result = await collection.insert_one(doc)
@@ -217,11 +294,8 @@ async def get_sequence_analyses(sequence: str = None, limit: int = 50) -> List[S
     if sequence:
         query["sequence"] = sequence
     
-    cursor = collection.find(query).sort("created_at", -1).limit(limit)
-    analyses = []
+    docs = await collection.find(query).sort("created_at", -1).limit(limit).to_list(length=limit)
     
-    async for doc in cursor:
+    for doc in docs:
         doc["id"] = str(doc.pop("_id"))
-        analyses.append(SequenceAnalysis(**doc))
-    
-    return analyses
+    return [SequenceAnalysis.model_construct(**doc) for doc in docs]
@@ -1,7 +1,40 @@
+import functools
 import math
+from itertools import repeat
+from operator import itemgetter
 from typing import List, Tuple
 
+import numpy as np
+
 VALID_BASES = {"A", "T", "G", "C"}
+_VALID_BYTES = b"ATGC"
+
+# Per-byte lookup tables for encode_sequence (indexed by ASCII code)
+_CLASS_LUT = np.zeros(256, dtype=bool)  # Qubit 0 flipped for pyrimidines
+_CLASS_LUT[[ord("C"), ord("T")]] = True
+_IDENT_LUT = np.zeros(256, dtype=bool)  # Qubit 2 flipped for G/T
+_IDENT_LUT[[ord("G"), ord("T")]] = True
+_THETA_LUT = np.full(256, np.nan)
+_THETA_LUT[[ord("A"), ord("T")]] = math.pi / 3
+_THETA_LUT[[ord("G"), ord("C")]] = math.pi / 2
+
+
+@functools.lru_cache(maxsize=8192)
+def _validate(seq: str) -> str:
+    """Normalize a sequence, raising ValueError on non-ACGT bases (memoized)"""
+    normalized = seq.strip().upper()
+    # Deleting every valid byte in C leaves nothing for a clean sequence;
+    # only the error path walks the characters in Python
+    raw = normalized.encode("utf-8")
+    if raw.translate(None, _VALID_BYTES):
+        invalid = set(normalized) - VALID_BASES
+        raise ValueError(f"Invalid bases found: {sorted(invalid)}")
+    return normalized
+
+
+def clear_cache():
+    """Forget memoized validation results"""
+    _validate.cache_clear()
 
 
 class PhysioQEncoder:
@@ -15,24 +48,21 @@ class PhysioQEncoder:
     }
 
     def validate(self, seq: str) -> str:
-        normalized = seq.strip().upper()
-        invalid = [b for b in normalized if b not in VALID_BASES]
-        if invalid:
-            raise ValueError(f"Invalid bases found: {sorted(set(invalid))}")
-        return normalized
+        # The same sequences recur across endpoints, batch items and BLAST
+        # databases, so results are shared by every encoder instance
+        return _validate(seq)
 
     def encode_sequence(self, seq: str, start_qubit: int = 0) -> Tuple[List[tuple], int]:
         seq = self.validate(seq)
-        ops: List[tuple] = []
-        for i, base in enumerate(seq):
-            q = start_qubit + i * 3
-            # Qubit 0: chemical class (purine/pyrimidine)
-            if base in {"C", "T"}:
-                ops.append(("PauliX", q))
-            # Qubit 1: hydrogen bonding strength
-            theta = self.hydrogen_angles[base]
-            ops.append(("RY", q + 1, theta))
-            # Qubit 2: base identity marker
-            if base in {"G", "T"}:
-                ops.append(("PauliX", q + 2))
+        codes = np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+        base_qubits = start_qubit + 3 * np.arange(len(codes))
+        # Qubit 0: chemical class (purine/pyrimidine); qubit 2: base identity marker
+        flipped = np.concatenate((
+            base_qubits[_CLASS_LUT[codes]],
+            base_qubits[_IDENT_LUT[codes]] + 2,
+        )).tolist()
+        # Qubit 1: hydrogen bonding strength
+        ops: List[tuple] = list(zip(repeat("PauliX"), flipped))
+        ops.extend(zip(repeat("RY"), (base_qubits + 1).tolist(), _THETA_LUT[codes].tolist()))
+        ops.sort(key=itemgetter(1))  # Qubit order, as if emitted base by base
         return ops, len(seq) * 3
@@ -1,12 +1,52 @@
 """
 Processing logger for tracking and visualizing internal steps
 """
-import time
+import atexit
 import logging
+import queue
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from .models import ProcessingStep
 
+# Records are handed to a background thread that buffers them and writes
+# them to stderr in batches, so job pipelines never block on console I/O
+_log_handler: Optional[QueueHandler] = None
+_log_buffer: Optional[MemoryHandler] = None
+LOG_BUFFER_CAPACITY = 64  # Records buffered before a write (errors flush at once)
+
+
+def _queue_handler() -> QueueHandler:
+    """Shared queue handler, starting its listener thread on first use"""
+    global _log_handler, _log_buffer
+    if _log_handler is None:
+        log_queue = queue.Queue(-1)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+        _log_buffer = MemoryHandler(
+            LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=stream_handler
+        )
+        listener = QueueListener(log_queue, _log_buffer)
+        listener.start()
+
+        def stop():
+            # Drain the queue, then write whatever is still buffered
+            listener.stop()
+            _log_buffer.flush()
+
+        atexit.register(stop)
+        _log_handler = QueueHandler(log_queue)
+    return _log_handler
+
+
+def _flush_logs():
+    """Write out buffered records (those still queued follow with the next batch)"""
+    if _log_buffer is not None:
+        _log_buffer.flush()
+
 
 class ProcessingLogger:
     """
@@ -23,12 +63,7 @@ class ProcessingLogger:
         # Setup Python logging
         self.logger = logging.getLogger(f"QGENOME.{job_name}")
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            self.logger.addHandler(_queue_handler())
             self.logger.setLevel(logging.INFO)
     
     def start_step(self, step_name: str, details: Dict[str, Any] = None):
@@ -36,10 +71,11 @@ class ProcessingLogger:
         self.current_step_name = step_name
         self.current_step_start = time.time()
         
-        log_msg = f"[START] {step_name}"
+        # Arguments are only formatted if the record is emitted
         if details:
-            log_msg += f" | {details}"
-        self.logger.info(log_msg)
+            self.logger.info("[START] %s | %s", step_name, details)
+        else:
+            self.logger.info("[START] %s", step_name)
         
         return self
     
@@ -60,10 +96,16 @@ class ProcessingLogger:
         
         self.steps.append(step)
         
-        log_msg = f"[END] {self.current_step_name} | Duration: {duration_ms:.2f}ms | Status: {status}"
         if additional_details:
-            log_msg += f" | {additional_details}"
-        self.logger.info(log_msg)
+            self.logger.info(
+                "[END] %s | Duration: %.2fms | Status: %s | %s",
+                self.current_step_name, duration_ms, status, additional_details
+            )
+        else:
+            self.logger.info(
+                "[END] %s | Duration: %.2fms | Status: %s",
+                self.current_step_name, duration_ms, status
+            )
         
         self.current_step_start = None
         self.current_step_name = None
@@ -72,17 +114,21 @@ class ProcessingLogger:
     
     def log_info(self, message: str, details: Dict[str, Any] = None):
         """Log an info message"""
-        log_msg = f"[INFO] {message}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if details:
-            log_msg += f" | {details}"
-        self.logger.info(log_msg)
+            self.logger.info("[INFO] %s | %s", message, details)
+        else:
+            self.logger.info("[INFO] %s", message)
     
     def log_error(self, message: str, error: Exception = None):
         """Log an error message"""
-        log_msg = f"[ERROR] {message}"
         if error:
-            log_msg += f" | {str(error)}"
-        self.logger.error(log_msg)
+            # Include the traceback when the error was raised
+            exc_info = error if error.__traceback__ is not None else None
+            self.logger.error("[ERROR] %s | %s", message, error, exc_info=exc_info)
+        else:
+            self.logger.error("[ERROR] %s", message)
     
     def get_steps(self) -> List[ProcessingStep]:
         """Get all recorded processing steps"""
@@ -90,6 +136,7 @@ class ProcessingLogger:
     
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of all processing steps"""
+        _flush_logs()
         total_duration = sum(step.duration_ms or 0 for step in self.steps)
         
         return {
@@ -109,6 +156,7 @@ class ProcessingLogger:
     
     def reset(self):
         """Reset the logger for a new job"""
+        _flush_logs()
         self.steps = []
         self.current_step_start = None
         self.current_step_name = None
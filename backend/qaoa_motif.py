@@ -1,10 +1,13 @@
 from __future__ import annotations
-import math
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List
-from collections import defaultdict
 from .physioq_encoder import PhysioQEncoder
 
+# Base code per ASCII byte; validated sequences only contain A, C, G, T
+_BASE_LUT = np.zeros(256, dtype=np.intp)
+_BASE_LUT[[ord("A"), ord("C"), ord("G"), ord("T")]] = [0, 1, 2, 3]
+
 
 class QAOAMotifFinder:
     """PWM-based motif finder approximating a QAOA cost landscape."""
@@ -15,6 +18,8 @@ class QAOAMotifFinder:
     def _validate(self, sequences: List[str], motif_length: int) -> List[str]:
         if not sequences:
             raise ValueError("Provide at least one sequence")
+        if motif_length < 1:
+            raise ValueError("Motif length must be positive")
         normalized = []
         for s in sequences:
             clean = self.encoder.validate(s)
@@ -23,55 +28,48 @@ class QAOAMotifFinder:
             normalized.append(clean)
         return normalized
 
-    def _build_pwm(self, windows: List[str], motif_length: int) -> np.ndarray:
-        base_index = {"A": 0, "C": 1, "G": 2, "T": 3}
+    def _encode(self, seq: str) -> np.ndarray:
+        """Base codes (A=0, C=1, G=2, T=3) of a validated sequence"""
+        return _BASE_LUT[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+
+    def _build_pwm(self, windows: np.ndarray, motif_length: int) -> np.ndarray:
         counts = np.ones((4, motif_length))  # Laplace smoothing
-        for w in windows:
-            for idx, base in enumerate(w):
-                counts[base_index[base], idx] += 1
+        for col in range(motif_length):
+            counts[:, col] += np.bincount(windows[:, col], minlength=4)
         probs = counts / counts.sum(axis=0, keepdims=True)
         return probs
 
     def _information_content(self, pwm: np.ndarray) -> float:
-        total_ic = 0.0
-        for col in pwm.T:
-            entropy = -sum(p * math.log2(p) for p in col)
-            total_ic += max(0.0, 2.0 - entropy)  # 2 bits max per DNA position
-        return float(total_ic)
+        entropy = -(pwm * np.log2(pwm)).sum(axis=0)
+        # 2 bits max per DNA position; columns added in order, as before
+        return float(sum(np.maximum(0.0, 2.0 - entropy).tolist()))
 
     def find_motif(self, sequences: List[str], motif_length: int = 6) -> Dict:
         sequences = self._validate(sequences, motif_length)
-        candidate_windows: List[str] = []
-        positions: defaultdict[int, List[int]] = defaultdict(list)
-        # Collect all windows for PWM estimation
-        for idx, seq in enumerate(sequences):
-            for i in range(0, len(seq) - motif_length + 1):
-                window = seq[i : i + motif_length]
-                candidate_windows.append(window)
-                positions[idx].append(i)
-        pwm = self._build_pwm(candidate_windows, motif_length)
+        # Every window of every sequence as rows of base codes, for PWM estimation
+        per_sequence = [sliding_window_view(self._encode(seq), motif_length) for seq in sequences]
+        windows = np.concatenate(per_sequence)
+        pwm = self._build_pwm(windows, motif_length)
         ic = self._information_content(pwm)
 
-        # Score each window using log-likelihood under the PWM
-        base_index = {"A": 0, "C": 1, "G": 2, "T": 3}
-        best_score = -1e9
-        best_window = None
-        best_pos = None
-        for seq_idx, seq in enumerate(sequences):
-            for pos in positions[seq_idx]:
-                window = seq[pos : pos + motif_length]
-                log_likelihood = 0.0
-                for col, base in enumerate(window):
-                    p = pwm[base_index[base], col]
-                    log_likelihood += math.log(p)
-                if log_likelihood > best_score:
-                    best_score = log_likelihood
-                    best_window = window
-                    best_pos = {"sequence_index": seq_idx, "start": pos}
+        # Score each window using log-likelihood under the PWM, adding the
+        # columns left to right
+        log_pwm = np.log(pwm)
+        scores = log_pwm[windows[:, 0], 0]
+        for col in range(1, motif_length):
+            scores += log_pwm[windows[:, col], col]
+        best = int(scores.argmax())  # First window on ties
+
+        # Map the flat window index back to its sequence and start
+        seq_idx = 0
+        start = best
+        while start >= len(per_sequence[seq_idx]):
+            start -= len(per_sequence[seq_idx])
+            seq_idx += 1
 
         return {
-            "motif": best_window,
-            "positions": best_pos,
-            "score": float(best_score),
+            "motif": sequences[seq_idx][start : start + motif_length],
+            "positions": {"sequence_index": seq_idx, "start": start},
+            "score": float(scores[best]),
             "information_content": ic,
         }
@@ -2,9 +2,19 @@ from __future__ import annotations
 import math
 import numpy as np
 from typing import Dict, List, Tuple
-from collections import Counter
 from .physioq_encoder import PhysioQEncoder
 
+# Per-byte lookup tables for the feature helpers (indexed by ASCII code)
+_IS_GC = np.zeros(256, dtype=bool)
+_IS_GC[[ord("G"), ord("C")]] = True
+_BASE_BITS = np.zeros(256, dtype=np.intp)
+_BASE_BITS[[ord("A"), ord("C"), ord("G"), ord("T")]] = [0, 1, 2, 3]
+_IS_PURINE = np.zeros(256, dtype=bool)
+_IS_PURINE[[ord("A"), ord("G")]] = True
+_ANGLE_LUT = np.zeros(256)
+for _base, _angle in PhysioQEncoder.hydrogen_angles.items():
+    _ANGLE_LUT[ord(_base)] = _angle
+
 
 class QCNNVariantDetector:
     """QCNN-inspired classifier using biologically meaningful features."""
@@ -15,58 +25,54 @@ class QCNNVariantDetector:
         self.weights = np.array([0.6, 1.2, -0.8, 0.4, 0.9, -0.3])
         self.bias = -0.2
 
-    def _gc_content(self, seq: str) -> float:
-        gc = sum(1 for c in seq if c in {"G", "C"})
-        return gc / len(seq)
+    def _gc_content(self, codes: np.ndarray) -> float:
+        return int(_IS_GC[codes].sum()) / len(codes)
 
-    def _transition_transversion_ratio(self, seq: str) -> float:
-        transitions = 0
-        transversions = 0
-        purines = {"A", "G"}
-        pyrimidines = {"C", "T"}
-        for a, b in zip(seq, seq[1:]):
-            if a == b:
-                continue
-            if (a in purines and b in purines) or (a in pyrimidines and b in pyrimidines):
-                transitions += 1
-            else:
-                transversions += 1
+    def _transition_transversion_ratio(self, codes: np.ndarray) -> float:
+        purine = _IS_PURINE[codes]
+        # Only neighbouring pairs of different bases count
+        changed = codes[1:] != codes[:-1]
+        same_class = purine[1:] == purine[:-1]
+        transitions = int((changed & same_class).sum())
+        transversions = int(changed.sum()) - transitions
         if transversions == 0:
             return float(transitions) if transitions > 0 else 0.0
         return transitions / transversions
 
-    def _longest_homopolymer(self, seq: str) -> int:
-        longest = 1
-        current = 1
-        for a, b in zip(seq, seq[1:]):
-            if a == b:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-        return longest
+    def _longest_homopolymer(self, codes: np.ndarray) -> int:
+        # Runs start at 0 and after every change of base
+        run_starts = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        bounds = np.concatenate(([0], run_starts, [len(codes)]))
+        return int(np.diff(bounds).max())
 
-    def _kmer_entropy(self, seq: str, k: int = 3) -> float:
-        counts = Counter(seq[i : i + k] for i in range(len(seq) - k + 1))
-        total = sum(counts.values())
-        if total == 0:
+    def _kmer_entropy(self, codes: np.ndarray, k: int = 3) -> float:
+        n_kmers = len(codes) - k + 1
+        if n_kmers <= 0:
             return 0.0
-        entropy = -sum((c / total) * math.log2(c / total) for c in counts.values())
-        return entropy / k
+        # Pack each k-mer's 2-bit base codes into one integer id
+        bits = _BASE_BITS[codes]
+        ids = np.zeros(n_kmers, dtype=np.intp)
+        for offset in range(k):
+            ids = (ids << 2) | bits[offset : offset + n_kmers]
+        counts = np.bincount(ids)
+        p = counts[counts > 0] / n_kmers
+        entropy = -(p * np.log2(p)).sum()
+        return float(entropy / k)
 
-    def _physioq_mean_angle(self, seq: str) -> float:
-        angles = [self.encoder.hydrogen_angles[b] for b in seq]
-        return float(sum(angles) / len(angles))
+    def _physioq_mean_angle(self, codes: np.ndarray) -> float:
+        return float(_ANGLE_LUT[codes].sum() / len(codes))
 
     def extract_features(self, seq: str) -> np.ndarray:
+        # One byte decode serves every byte-level feature
+        codes = np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
         length_norm = len(seq) / 500.0
         return np.array(
             [
-                self._gc_content(seq),
-                self._transition_transversion_ratio(seq),
-                self._longest_homopolymer(seq) / len(seq),
-                self._kmer_entropy(seq),
-                self._physioq_mean_angle(seq) / math.pi,
+                self._gc_content(codes),
+                self._transition_transversion_ratio(codes),
+                self._longest_homopolymer(codes) / len(seq),
+                self._kmer_entropy(codes),
+                self._physioq_mean_angle(codes) / math.pi,
                 length_norm,
             ]
         )
@@ -74,10 +80,10 @@ class QCNNVariantDetector:
     def train(self, training_data: List[Tuple[str, int]], epochs: int = 10) -> Dict:
         # Simple perceptron-style update using provided labels (1 pathogenic, 0 benign)
         lr = 0.1
+        # Features do not change between epochs, so extract them once
+        samples = [(self.extract_features(self.encoder.validate(seq)), label) for seq, label in training_data]
         for _ in range(epochs):
-            for seq, label in training_data:
-                seq = self.encoder.validate(seq)
-                x = self.extract_features(seq)
+            for x, label in samples:
                 logit = float(np.dot(self.weights, x) + self.bias)
                 pred = 1 / (1 + math.exp(-logit))
                 error = label - pred
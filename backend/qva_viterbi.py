@@ -3,12 +3,24 @@ Quantum Viterbi Algorithm (QVA) Implementation
 Uses Qiskit for quantum circuit simulation to decode DNA sequences
 """
 
-import numpy as np
+import functools
+import os
 import time
+
+import numpy as np
+from typing import Tuple
 from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import ParameterVector
 from qiskit_aer import AerSimulator
 from qiskit.visualization import circuit_drawer
-from .hmm_models import base_to_int, validate_sequence
+from .hmm_models import base_to_int, get_hmm_config, get_model_name, validate_sequence
+
+# Step simulation: "sampled" draws each step's measurements from its analytic
+# product-state distribution, "aer" runs the step circuits on Qiskit Aer
+QVA_SIMULATOR = os.getenv("QVA_SIMULATOR", "sampled")
+
+# Most runs of one step circuit batched into an Aer job by the "aer" simulation
+QVA_BLOCK_STEPS = 64
 
 
 def encode_dna_2qubit(base: str) -> str:
@@ -30,6 +42,32 @@ def encode_dna_2qubit(base: str) -> str:
     return mapping[base.upper()]
 
 
+def _step_angles(hmm_config: dict, obs_idx: int, current_probs: np.ndarray) -> Tuple[list, list]:
+    """
+    RY and RZ angles for one time step of Viterbi decoding
+
+    Args:
+        hmm_config: HMM configuration
+        obs_idx: Observed nucleotide index (0-3)
+        current_probs: Current state probabilities
+
+    Returns:
+        (ry_angles, rz_angles), one angle per state qubit
+    """
+    emit_prob = hmm_config['emit_prob']
+
+    # Use RY rotation to encode probability amplitude
+    # angle = 2 * arcsin(sqrt(p)), with p clipped to a valid probability
+    probs = np.clip(np.asarray(current_probs, dtype=float), 0.0, 1.0)
+    ry_angles = 2 * np.arcsin(np.sqrt(probs))
+
+    # Encode emission probability as RZ rotation, clipped away from 0 and 1
+    emission = np.clip(np.asarray(emit_prob, dtype=float)[:, obs_idx], 0.01, 0.99)
+    rz_angles = np.arccos(2 * emission - 1)
+
+    return ry_angles.tolist(), rz_angles.tolist()
+
+
 def build_qva_circuit(observations: str, hmm_config: dict, time_step: int, current_probs: np.ndarray) -> QuantumCircuit:
     """
     Build quantum circuit for one time step of Viterbi decoding
@@ -44,32 +82,19 @@ def build_qva_circuit(observations: str, hmm_config: dict, time_step: int, curre
         QuantumCircuit for this time step
     """
     n_states = hmm_config['n_states']
-    emit_prob = hmm_config['emit_prob']
+    obs_idx = base_to_int(observations[time_step])
+    ry_angles, rz_angles = _step_angles(hmm_config, obs_idx, current_probs)
 
     # Create quantum circuit (n_states qubits)
     qc = QuantumCircuit(n_states, n_states)
 
     # Step 1: Initialize state superposition based on current probabilities
     for s in range(n_states):
-        # Use RY rotation to encode probability amplitude
-        # angle = 2 * arcsin(sqrt(p))
-        prob = current_probs[s]
-        # Ensure probability is valid
-        prob = max(0.0, min(1.0, prob))
-        angle = 2 * np.arcsin(np.sqrt(prob))
-        qc.ry(angle, s)
+        qc.ry(ry_angles[s], s)
 
     # Step 2: Apply emission probability for observed nucleotide
-    obs_idx = base_to_int(observations[time_step])
-
     for s in range(n_states):
-        # Encode emission probability as RZ rotation
-        emission_prob = emit_prob[s][obs_idx]
-        # Ensure valid probability
-        emission_prob = max(0.01, min(0.99, emission_prob))
-        # Convert to angle
-        theta = np.arccos(2 * emission_prob - 1)
-        qc.rz(theta, s)
+        qc.rz(rz_angles[s], s)
 
     # Step 3: Measure all qubits
     qc.measure(range(n_states), range(n_states))
@@ -77,6 +102,150 @@ def build_qva_circuit(observations: str, hmm_config: dict, time_step: int, curre
     return qc
 
 
+@functools.lru_cache(maxsize=None)
+def _simulator() -> AerSimulator:
+    """Shared Aer simulator (one per process)"""
+    return AerSimulator()
+
+
+@functools.lru_cache(maxsize=32)
+def _step_circuit(n_states: int) -> Tuple[QuantumCircuit, ParameterVector, ParameterVector]:
+    """
+    Parameterized per-step circuit for an n_states HMM (untranspiled)
+
+    Every time step has the same gate layout as build_qva_circuit and only the
+    angles change.
+
+    Returns:
+        (circuit, RY parameters, RZ parameters)
+    """
+    ry = ParameterVector('ry', n_states)
+    rz = ParameterVector('rz', n_states)
+
+    qc = QuantumCircuit(n_states, n_states)
+    for s in range(n_states):
+        qc.ry(ry[s], s)
+    for s in range(n_states):
+        qc.rz(rz[s], s)
+    qc.measure(range(n_states), range(n_states))
+    return qc, ry, rz
+
+
+@functools.lru_cache(maxsize=32)
+def _step_depth(n_states: int) -> int:
+    """Depth of the per-step circuit (RY, RZ, measure), without a simulator"""
+    return _step_circuit(n_states)[0].depth()
+
+
+@functools.lru_cache(maxsize=32)
+def _compiled_step_circuit(n_states: int) -> Tuple[QuantumCircuit, ParameterVector, ParameterVector]:
+    """
+    Transpiled, parameterized per-step circuit for an n_states HMM
+
+    The circuit is transpiled once and re-bound per step.
+
+    Returns:
+        (transpiled circuit, RY parameters, RZ parameters)
+    """
+    qc, ry, rz = _step_circuit(n_states)
+    return transpile(qc, _simulator()), ry, rz
+
+
+def _most_likely_state(counts: dict, n_states: int) -> int:
+    """
+    State decoded from one step's measurement counts
+
+    For 2-state HMM: '00' or '01' -> 0, '10' or '11' -> 1; in general the
+    number of '1' bits of the most frequent bitstring, modulo n_states
+    """
+    most_likely_bitstring = max(counts, key=counts.get)
+    return int(most_likely_bitstring, 2).bit_count() % n_states
+
+
+def _decode_with_aer(observed: list, hmm_config: dict, start_probs: np.ndarray, shots: int) -> list:
+    """Decode state indices by running each step's circuit on the Aer simulator"""
+    n_states = hmm_config['n_states']
+    trans_prob = hmm_config['trans_prob']
+    decoded_path = []
+    prev_state = None
+
+    # Get quantum simulator and the compiled step circuit for this state count
+    simulator = _simulator()
+    template, ry_params, rz_params = _compiled_step_circuit(n_states)
+
+    # A step's circuit depends only on the previous state (None at t=0) and the
+    # observed base, so each distinct pair is bound once per run. The previous
+    # state is only known once the previous step is measured, so steps cannot
+    # be simulated ahead; instead each pair draws from a pool of independent
+    # shots-sized runs, refilled by one batched job twice the previous size
+    # (capped by QVA_BLOCK_STEPS and by how often the base still occurs)
+    remaining = [observed.count(obs_idx) for obs_idx in range(4)]
+    bound_circuits = {}
+    pools = {}
+    pool_sizes = {}
+
+    # Iterate through each position in the sequence
+    for obs_idx in observed:
+        key = (prev_state, obs_idx)
+        pool = pools.setdefault(key, [])
+        if not pool:
+            bound_qc = bound_circuits.get(key)
+            if bound_qc is None:
+                probs = start_probs if prev_state is None else trans_prob[prev_state]
+                ry_angles, rz_angles = _step_angles(hmm_config, obs_idx, probs)
+                # Non-strict: transpilation may drop gates (RZ right before a
+                # measurement) along with their parameters
+                bound_qc = template.assign_parameters(
+                    dict(zip(ry_params, ry_angles)) | dict(zip(rz_params, rz_angles)),
+                    strict=False
+                )
+                bound_circuits[key] = bound_qc
+
+            # Execute the batch of runs in one job
+            size = min(2 * pool_sizes.get(key, 0) or 1, QVA_BLOCK_STEPS, remaining[obs_idx])
+            pool_sizes[key] = size
+            result = simulator.run([bound_qc] * size, shots=shots).result()
+            pool.extend(_most_likely_state(result.get_counts(i), n_states) for i in range(size))
+        remaining[obs_idx] -= 1
+        state_idx = pool.pop()
+
+        # Append to decoded path; the next step starts from this state's
+        # transition probabilities
+        decoded_path.append(state_idx)
+        prev_state = state_idx
+
+    return decoded_path
+
+
+def _decode_sampled(observed: list, hmm_config: dict, start_probs: np.ndarray, shots: int) -> list:
+    """
+    Decode state indices by sampling each step's measurement distribution
+
+    A step circuit only applies RY then RZ to separate qubits, so it prepares
+    a product state; RZ is diagonal and leaves Z-basis probabilities alone,
+    and qubit s reads 1 with probability sin^2(ry_s / 2), the clipped state
+    probability. Sampling those independent bits gives the same distribution
+    of counts as the Aer simulation.
+    """
+    n_states = hmm_config['n_states']
+    trans_prob = np.asarray(hmm_config['trans_prob'], dtype=float)
+    rng = np.random.default_rng()
+    bit_values = 1 << np.arange(n_states)
+    # Set-bit count of every bitstring value, for the state index
+    popcounts = np.array([value.bit_count() for value in range(1 << n_states)])
+
+    decoded_path = []
+    probs = np.clip(start_probs, 0.0, 1.0)
+    for _ in observed:
+        bits = rng.random((shots, n_states)) < probs
+        counts = np.bincount(bits @ bit_values, minlength=1 << n_states)
+        state_idx = int(popcounts[counts.argmax()]) % n_states
+        decoded_path.append(state_idx)
+        probs = np.clip(trans_prob[state_idx], 0.0, 1.0)
+
+    return decoded_path
+
+
 def run_quantum_viterbi(sequence: str, hmm_config: dict, shots: int = 1024) -> dict:
     """
     Run Quantum Viterbi Algorithm for DNA sequence decoding
@@ -108,49 +277,19 @@ def run_quantum_viterbi(sequence: str, hmm_config: dict, shots: int = 1024) -> d
     n_states = hmm_config['n_states']
     states = hmm_config['states']
     start_prob = hmm_config['start_prob']
-    trans_prob = hmm_config['trans_prob']
-
-    # Initialize current state probabilities
-    current_probs = np.array(start_prob, dtype=float)
 
-    # Decoded path
-    decoded_path = []
-
-    # Get quantum simulator
-    simulator = AerSimulator()
-
-    # Circuit depth tracking
-    total_depth = 0
-
-    # Iterate through each position in the sequence
-    for t in range(len(cleaned_seq)):
-        # Build quantum circuit for this time step
-        qc = build_qva_circuit(cleaned_seq, hmm_config, t, current_probs)
+    # State probabilities of the first step
+    start_probs = np.array(start_prob, dtype=float)
 
-        # Track circuit depth
-        total_depth += qc.depth()
-
-        # Transpile circuit
-        transpiled_qc = transpile(qc, simulator)
-
-        # Execute circuit
-        job = simulator.run(transpiled_qc, shots=shots)
-        result = job.result()
-        counts = result.get_counts()
-
-        # Get most likely state from measurement results
-        most_likely_bitstring = max(counts, key=counts.get)
-
-        # Convert bitstring to state index
-        # For 2-state HMM: '00' or '01' -> 0, '10' or '11' -> 1
-        # Count number of '1' bits and take modulo n_states
-        state_idx = sum(int(bit) for bit in most_likely_bitstring) % n_states
-
-        # Append to decoded path
-        decoded_path.append(state_idx)
-
-        # Update probabilities for next time step using transition matrix
-        current_probs = trans_prob[state_idx].copy()
+    observed = [base_to_int(base) for base in cleaned_seq]
+    if QVA_SIMULATOR == 'aer':
+        decoded_path = _decode_with_aer(observed, hmm_config, start_probs, shots)
+        simulator_name = 'Qiskit Aer'
+    else:
+        decoded_path = _decode_sampled(observed, hmm_config, start_probs, shots)
+        simulator_name = 'NumPy (product-state sampling)'
+    # Taken from the untranspiled template, so the sampled path needs no Aer
+    step_depth = _step_depth(n_states)
 
     # Convert state indices to state labels
     decoded_path_labels = [states[idx] for idx in decoded_path]
@@ -160,8 +299,8 @@ def run_quantum_viterbi(sequence: str, hmm_config: dict, shots: int = 1024) -> d
     end_time = time.perf_counter()
     runtime_ms = (end_time - start_time) * 1000
 
-    # Calculate average circuit depth
-    avg_depth = total_depth / len(cleaned_seq) if len(cleaned_seq) > 0 else 0
+    # Every step runs the same gate layout
+    avg_depth = step_depth if len(cleaned_seq) > 0 else 0
 
     return {
         'decoded_path': decoded_path_labels,
@@ -174,7 +313,7 @@ def run_quantum_viterbi(sequence: str, hmm_config: dict, shots: int = 1024) -> d
         'sequence_length': len(cleaned_seq),
         'n_states': n_states,
         'algorithm': 'Quantum Viterbi Algorithm (QVA)',
-        'simulator': 'Qiskit Aer'
+        'simulator': simulator_name
     }
 
 
@@ -196,14 +335,27 @@ def generate_circuit_diagram(sequence: str, hmm_config: dict, time_step: int = 0
     if time_step >= len(cleaned_seq):
         time_step = 0
 
-    # Build circuit for specified time step
+    # The diagram depends only on the model and the base at time_step
+    base = cleaned_seq[time_step]
+    model_name = get_model_name(hmm_config)
+    if model_name is not None:
+        return _circuit_diagram_text(model_name, base)
+    return _draw_circuit(hmm_config, base)
+
+
+def _draw_circuit(hmm_config: dict, base: str) -> str:
+    # Build the circuit for a step observing base, from the start distribution
     current_probs = np.array(hmm_config['start_prob'], dtype=float)
-    qc = build_qva_circuit(cleaned_seq, hmm_config, time_step, current_probs)
+    qc = build_qva_circuit(base, hmm_config, 0, current_probs)
 
     # Generate text-based circuit diagram
-    circuit_str = str(qc.draw(output='text'))
+    return str(qc.draw(output='text'))
+
 
-    return circuit_str
+@functools.lru_cache(maxsize=128)
+def _circuit_diagram_text(model_name: str, base: str) -> str:
+    """Cached diagram for a registered model (at most four per model)"""
+    return _draw_circuit(get_hmm_config(model_name), base)
 
 
 def batch_quantum_viterbi(sequences: list, hmm_config: dict, shots: int = 1024) -> list:
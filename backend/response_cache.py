@@ -0,0 +1,107 @@
+"""
+Content-addressed response cache for deterministic endpoints
+Backed by Redis when REDIS_URL is set; every call is computed otherwise
+"""
+
+import asyncio
+import functools
+import os
+from typing import Optional
+
+import orjson
+from dotenv import load_dotenv
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:
+    # redis not installed: caching stays disabled
+    aioredis = None
+    RedisError = OSError
+
+try:
+    from blake3 import blake3 as _digest
+except ImportError:
+    # Same 32-byte digest size as blake3
+    from hashlib import blake2b
+    _digest = functools.partial(blake2b, digest_size=32)
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL")
+DEFAULT_TTL = 86400  # One day
+
+# Global Redis client (None when caching is disabled)
+_redis_client: Optional["aioredis.Redis"] = None
+
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+async def connect_to_redis():
+    """Initialize the Redis client on app startup (no-op without REDIS_URL)"""
+    global _redis_client
+    if not REDIS_URL or aioredis is None:
+        return
+    _redis_client = aioredis.from_url(REDIS_URL)
+    print(f"Response cache enabled at {REDIS_URL}")
+
+
+async def close_redis_connection():
+    """Close the Redis client on app shutdown"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+        print("Redis connection closed")
+
+
+def cache_key(endpoint: str, payload: bytes) -> str:
+    """Key a response by endpoint and a digest of its request payload"""
+    return f"qgenome:{endpoint}:{_digest(payload).hexdigest()}"
+
+
+def cached(endpoint: str, ttl: int = DEFAULT_TTL):
+    """
+    Cache the JSON response of an endpoint that is a pure function of its body
+
+    The wrapped endpoint must take a single Pydantic request model. Hits are
+    served as the stored orjson bytes; errors are never cached, and Redis
+    failures fall through to computing the response.
+
+    Args:
+        endpoint: Name used in the cache key
+        ttl: Seconds to keep a cached response
+    """
+    def decorator(func):
+        is_async = asyncio.iscoroutinefunction(func)
+
+        async def compute(req):
+            if is_async:
+                return await func(req)
+            return await run_in_threadpool(func, req)
+
+        @functools.wraps(func)
+        async def wrapper(req):
+            if _redis_client is None:
+                return await compute(req)
+
+            key = cache_key(endpoint, req.model_dump_json().encode())
+            try:
+                hit = await _redis_client.get(key)
+            except RedisError:
+                hit = None
+            if hit is not None:
+                return Response(content=hit, media_type="application/json")
+
+            body = orjson.dumps(await compute(req), option=_DUMP_OPTIONS)
+            try:
+                await _redis_client.set(key, body, ex=ttl)
+            except RedisError:
+                pass
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
@@ -31,23 +31,28 @@ async def setup_mongodb():
         
         print("\n[3/3] Creating indexes...")
         
-        # Datasets collection
         datasets_col = db["datasets"]
-        await datasets_col.create_index("name")
-        await datasets_col.create_index([("created_at", -1)])
-        print("✓ Datasets indexes created")
-        
-        # Processing jobs collection
         jobs_col = db["processing_jobs"]
-        await jobs_col.create_index("status")
-        await jobs_col.create_index("algorithm")
-        await jobs_col.create_index([("created_at", -1)])
-        print("✓ Processing jobs indexes created")
-        
-        # Sequence runs collection
         runs_col = db["sequence_runs"]
-        await runs_col.create_index("run_type")
-        await runs_col.create_index([("created_at", -1)])
+        
+        # Independent round trips, so issue them all at once
+        await asyncio.gather(
+            # Datasets collection
+            datasets_col.create_index("name"),
+            datasets_col.create_index([("created_at", -1)]),
+            # Processing jobs collection
+            jobs_col.create_index([("status", 1), ("algorithm", 1), ("created_at", -1)]),
+            jobs_col.create_index("algorithm"),
+            jobs_col.create_index([("created_at", -1)]),
+            # Sequence runs collection
+            runs_col.create_index([("run_type", 1), ("created_at", -1)]),
+            runs_col.create_index([("created_at", -1)]),
+        )
+        # The compound (run_type, created_at) index replaces the run_type one
+        if "run_type_1" in await runs_col.index_information():
+            await runs_col.drop_index("run_type_1")
+        print("✓ Datasets indexes created")
+        print("✓ Processing jobs indexes created")
         print("✓ Sequence runs indexes created")
         
         print("\n" + "=" * 80)
@@ -1,8 +1,19 @@
 from __future__ import annotations
 import numpy as np
-from typing import Dict, List, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Tuple
 from .physioq_encoder import PhysioQEncoder
 
+try:
+    from .alignment_numba import sw_fill_into
+except ImportError:
+    # Numba not installed: fill by anti-diagonals with NumPy instead
+    sw_fill_into = None
+
+# 2-bit base codes per ASCII byte for BLAST word codes
+_BASE_CODES = np.zeros(256, dtype=np.int64)
+_BASE_CODES[[ord("A"), ord("C"), ord("G"), ord("T")]] = [0, 1, 2, 3]
+
 
 class SmithWaterman:
     """Smith-Waterman local sequence alignment algorithm."""
@@ -22,7 +33,7 @@ class SmithWaterman:
 
     def _init_matrices(self, n: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
         scores = np.zeros((n + 1, m + 1))
-        traceback = np.zeros((n + 1, m + 1), dtype=int)
+        traceback = np.zeros((n + 1, m + 1), dtype=np.uint8)
         return scores, traceback
 
     def _traceback(self, traceback: np.ndarray, seq1: str, seq2: str, start_i: int, start_j: int) -> Tuple[str, str, str]:
@@ -50,34 +61,48 @@ class SmithWaterman:
                 j -= 1
         return "".join(reversed(aligned1)), "".join(reversed(aligned2)), "".join(reversed(path))
 
+    def _fill(self, seq1: str, seq2: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Fill the local alignment matrices.
+
+        Uses the compiled kernel when Numba is available. Otherwise each
+        anti-diagonal (i + j == d), which depends only on the two previous
+        diagonals, is computed as a whole with NumPy.
+        Traceback codes: 0 diagonal or zero (start), 1 up, 2 left.
+        """
+        n, m = len(seq1), len(seq2)
+        scores, traceback = self._init_matrices(n, m)
+        s1 = np.frombuffer(seq1.encode("ascii"), dtype=np.uint8)
+        s2 = np.frombuffer(seq2.encode("ascii"), dtype=np.uint8)
+
+        if sw_fill_into is not None:
+            sw_fill_into(s1, s2, self.match_score, self.mismatch_penalty, self.gap_penalty, scores, traceback)
+            return scores, traceback
+
+        for d in range(2, n + m + 1):
+            i = np.arange(max(1, d - m), min(n, d - 1) + 1)
+            j = d - i
+            match = scores[i - 1, j - 1] + np.where(s1[i - 1] == s2[j - 1], self.match_score, self.mismatch_penalty)
+            delete = scores[i - 1, j] + self.gap_penalty
+            insert = scores[i, j - 1] + self.gap_penalty
+            best = np.maximum(np.maximum(match, delete), np.maximum(insert, 0.0))
+            scores[i, j] = best
+            # Ties resolve zero/diagonal first, then up, then left
+            traceback[i, j] = np.where((best == 0.0) | (best == match), 0, np.where(best == delete, 1, 2))
+
+        return scores, traceback
+
     def align(self, seq1: str, seq2: str) -> Dict:
         seq1, seq2 = self._validate_inputs(seq1, seq2)
+        return self._align_validated(seq1, seq2)
+
+    def _align_validated(self, seq1: str, seq2: str) -> Dict:
         n, m = len(seq1), len(seq2)
-        scores, traceback = self._init_matrices(n, m)
+        scores, traceback = self._fill(seq1, seq2)
 
-        max_score = 0.0
-        max_i, max_j = 0, 0
-
-        for i in range(1, n + 1):
-            for j in range(1, m + 1):
-                match = scores[i - 1, j - 1] + (self.match_score if seq1[i - 1] == seq2[j - 1] else self.mismatch_penalty)
-                delete = scores[i - 1, j] + self.gap_penalty
-                insert = scores[i, j - 1] + self.gap_penalty
-                best = max(match, delete, insert, 0.0)
-                scores[i, j] = best
-
-                if best == 0.0:
-                    traceback[i, j] = 0
-                elif best == match:
-                    traceback[i, j] = 0
-                elif best == delete:
-                    traceback[i, j] = 1
-                else:
-                    traceback[i, j] = 2
-
-                if best > max_score:
-                    max_score = best
-                    max_i, max_j = i, j
+        # First cell in row-major order holding the best positive score
+        flat_best = int(np.argmax(scores))
+        max_score = float(scores.flat[flat_best])
+        max_i, max_j = divmod(flat_best, m + 1) if max_score > 0.0 else (0, 0)
 
         if max_i == 0 or max_j == 0:
             return {
@@ -112,38 +137,94 @@ class BlastLike:
         self.encoder = PhysioQEncoder()
         self.word_size = word_size
         self.smith_waterman = SmithWaterman()
+        self._index: Optional[Tuple[List[str], np.ndarray, np.ndarray]] = None
+
+    def _word_codes(self, seq: str) -> np.ndarray:
+        """Integer code of every word in a validated sequence (2 bits per base)"""
+        k = self.word_size
+        if len(seq) < k:
+            return np.empty(0, dtype=np.int64)
+        codes = _BASE_CODES[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+        return sliding_window_view(codes, k) @ (4 ** np.arange(k - 1, -1, -1, dtype=np.int64))
+
+    def _build_index(self, database: List[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Validate the database and list every word occurrence, sorted by word code
+
+        Returns the sequences, the sorted word codes and the index of the
+        sequence each occurrence belongs to.
+        """
+        sequences = [self.encoder.validate(seq) for seq in database]
+        word_codes = [self._word_codes(seq) for seq in sequences]
+        owners = np.repeat(
+            np.arange(len(sequences), dtype=np.int32),
+            [len(codes) for codes in word_codes],
+        )
+        word_codes = np.concatenate(word_codes) if word_codes else np.empty(0, dtype=np.int64)
+        order = np.argsort(word_codes, kind="stable")
+        return sequences, word_codes[order], owners[order]
+
+    def index(self, database: List[str]) -> None:
+        """Index a database once so later searches can omit it"""
+        self._index = self._build_index(database)
+
+    def _seed_hits(self, query: str, word_codes: np.ndarray, owners: np.ndarray, n_sequences: int) -> np.ndarray:
+        # Each query occurrence pairs with every database occurrence of the
+        # word, so a word seen c times in the query weighs its postings by c
+        query_codes, counts = np.unique(self._word_codes(query), return_counts=True)
+        starts = np.searchsorted(word_codes, query_codes, side="left")
+        sizes = np.searchsorted(word_codes, query_codes, side="right") - starts
+        # Positions of every matching posting, run by run
+        offsets = np.cumsum(sizes) - sizes
+        postings = np.arange(sizes.sum()) + np.repeat(starts - offsets, sizes)
+        hits = np.bincount(owners[postings], weights=np.repeat(counts, sizes), minlength=n_sequences)
+        return hits.astype(np.int64)
+
+    def search(
+        self,
+        query: str,
+        database: Optional[List[str]] = None,
+        top_k: int = 5,
+        min_seed_hits: int = 1,
+        candidates_per_result: int = 10,
+    ) -> List[Dict]:
+        """Search database, or the one given to index() when database is None"""
+        if database is not None:
+            sequences, word_codes, owners = self._build_index(database)
+        elif self._index is not None:
+            sequences, word_codes, owners = self._index
+        else:
+            raise ValueError("Provide a database or index one first")
+        query = self.encoder.validate(query)
+        if len(query) < self.word_size:
+            return []
 
-    def _generate_words(self, seq: str) -> Dict[str, List[int]]:
-        words = {}
-        for i in range(len(seq) - self.word_size + 1):
-            word = seq[i : i + self.word_size]
-            if word not in words:
-                words[word] = []
-            words[word].append(i)
-        return words
+        hits = self._seed_hits(query, word_codes, owners, len(sequences))
+        lengths = np.fromiter(map(len, sequences), dtype=np.intp, count=len(sequences))
+        seeded = np.flatnonzero((lengths >= self.word_size) & (hits >= min_seed_hits))
 
-    def search(self, query: str, database: List[str], top_k: int = 5) -> List[Dict]:
-        query = self.encoder.validate(query)
-        database = [self.encoder.validate(seq) for seq in database]
+        # Only the best-seeded candidates pay for the full Smith-Waterman
+        # alignment (earlier sequences win seed ties); they are aligned in
+        # database order so score ties keep it
+        order = np.argsort(-hits[seeded], kind="stable")[: candidates_per_result * top_k]
+        shortlist = np.sort(seeded[order]).tolist()
 
-        query_words = self._generate_words(query)
         results = []
-
-        for db_seq in database:
-            db_words = self._generate_words(db_seq)
-            hits = 0
-            for word in query_words:
-                if word in db_words:
-                    hits += len(query_words[word]) * len(db_words[word])
-
-            if hits > 0:
-                sw_result = self.smith_waterman.align(query, db_seq)
-                results.append({
-                    "sequence": db_seq[:50] + "..." if len(db_seq) > 50 else db_seq,
-                    "word_matches": hits,
-                    "alignment_score": sw_result["score"],
-                    "evalue": float(hits) / (len(query) * len(db_seq)),
-                })
+        for idx in shortlist:
+            db_seq = sequences[idx]
+            word_matches = int(hits[idx])
+            # Query and database are already validated and non-empty
+            sw_result = self.smith_waterman._align_validated(query, db_seq)
+            results.append({
+                "sequence": db_seq[:50] + "..." if len(db_seq) > 50 else db_seq,
+                "word_matches": word_matches,
+                "alignment_score": sw_result["score"],
+                "evalue": float(word_matches) / (len(query) * len(db_seq)),
+            })
 
         results.sort(key=lambda x: x["alignment_score"], reverse=True)
         return results[:top_k]
+
+
+def warm_up():
+    """Compile the Numba local alignment kernel ahead of the first request"""
+    SmithWaterman().align("ACGT", "AGT")
@@ -1,7 +1,138 @@
 from __future__ import annotations
+import functools
 import numpy as np
 from typing import Dict, List
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba not installed: the coordinate helper runs vectorized in NumPy
+    njit = None
+
+
+def _helix_geometry(n: int, radius: float):
+    """Strand-1 base positions (n, 3) and backbone points (ceil(n / 3), 3).
+
+    Angles advance two full turns over the sequence; the rise is 0.34 nm
+    per base and backbone points sit at half radius on every third base.
+    """
+    positions = np.empty((n, 3))
+    backbone = np.empty(((n + 2) // 3, 3))
+    for i in range(n):
+        angle = (i / n) * 4 * np.pi
+        c = np.cos(angle)
+        s = np.sin(angle)
+        height = i * 0.34
+        positions[i, 0] = radius * c
+        positions[i, 1] = radius * s
+        positions[i, 2] = height
+        if i % 3 == 0:
+            backbone[i // 3, 0] = radius * 0.5 * c
+            backbone[i // 3, 1] = radius * 0.5 * s
+            backbone[i // 3, 2] = height
+    return positions, backbone
+
+
+def _helix_geometry_numpy(n: int, radius: float):
+    """Vectorized _helix_geometry, used when Numba is not installed"""
+    index = np.arange(n)
+    angles = (index / n) * 4 * np.pi
+    c = np.cos(angles)
+    s = np.sin(angles)
+    positions = np.column_stack((radius * c, radius * s, index * 0.34))
+    every_third = slice(None, None, 3)
+    backbone = np.column_stack((
+        radius * 0.5 * c[every_third],
+        radius * 0.5 * s[every_third],
+        index[every_third] * 0.34,
+    ))
+    return positions, backbone
+
+
+if njit is not None:
+    _helix_geometry = njit(cache=True)(_helix_geometry)
+else:
+    _helix_geometry = _helix_geometry_numpy
+
+
+_BASE_COLORS = {"A": "#FF6B6B", "T": "#4ECDC4", "G": "#45B7D1", "C": "#FFA07A"}
+_COMPLEMENTS = {"A": "T", "T": "A", "G": "C", "C": "G"}
+
+
+def _base_pair(base: str) -> tuple:
+    """(color, complement, complement color, hydrogen bonds, pair label) for a base"""
+    comp_base = _COMPLEMENTS.get(base, "A")
+    # A-T has 2 hydrogen bonds, G-C has 3 hydrogen bonds
+    bond_strength = 2 if base in ("A", "T") else 3
+    return (
+        _BASE_COLORS.get(base, "#888888"),
+        comp_base,
+        _BASE_COLORS.get(comp_base, "#888888"),
+        bond_strength,
+        f"{base}-{comp_base}",
+    )
+
+
+def warm_up():
+    """Compile the Numba helpers ahead of the first request"""
+    _helix_geometry(16, 1.0)
+
+
+@functools.lru_cache(maxsize=256)
+def _circuit_layout(num_bases: int, algorithm: str) -> Dict:
+    """Circuit gate layout; it depends only on sequence length and algorithm.
+
+    Cached and shared between calls, so callers must not mutate it.
+    """
+    num_qubits = num_bases * 3
+    gates = []
+    
+    # Gates over the same qubits share one index list (the layout is only
+    # read and serialized)
+    if algorithm == "vqe":
+        # VQE circuit: encode -> parameterized rotations -> measure
+        all_qubits = list(range(num_qubits))
+        gates.append({"type": "encoding", "qubits": all_qubits, "label": "PhysioQ Encode"})
+        for i in range(0, num_qubits, 3):
+            gates.append({"type": "ry", "qubits": [i + 1], "angle": f"θ_{i//3}", "label": f"H-Bond"})
+        gates.append({"type": "measurement", "qubits": all_qubits, "label": "Measure"})
+    
+    elif algorithm == "qaoa":
+        # QAOA circuit: encode -> cost -> mixer -> repeat -> measure
+        qubits = list(range(min(num_qubits, 20)))
+        gates.append({"type": "encoding", "qubits": qubits, "label": "Encode"})
+        for p in range(2):
+            gates.append({"type": "cost", "qubits": qubits, "label": f"Cost(γ_{p})"})
+            gates.append({"type": "mixer", "qubits": qubits, "label": f"Mixer(β_{p})"})
+        gates.append({"type": "measurement", "qubits": qubits, "label": "Measure"})
+    
+    elif algorithm == "qcnn":
+        # QCNN circuit: encode -> convolution -> pooling -> classifier
+        current_qubits = num_qubits
+        layer = 0
+        ranges: Dict[int, List[int]] = {}  # Widths repeat across layers (12 and 6 at first)
+
+        def qubit_range(width: int) -> List[int]:
+            if width not in ranges:
+                ranges[width] = list(range(width))
+            return ranges[width]
+
+        while current_qubits > 1:
+            gates.append({"type": "conv", "qubits": qubit_range(min(current_qubits, 12)), "label": f"Conv_{layer}"})
+            gates.append({"type": "pool", "qubits": qubit_range(min(current_qubits // 2, 6)), "label": f"Pool_{layer}"})
+            current_qubits = current_qubits // 2
+            layer += 1
+        gates.append({"type": "classifier", "qubits": [0], "label": "Classify"})
+        gates.append({"type": "measurement", "qubits": [0], "label": "Measure"})
+    
+    return {
+        "algorithm": algorithm,
+        "num_qubits": num_qubits,
+        "gates": gates,
+        "depth": len(gates),
+        "sequence_length": num_bases,
+    }
+
 
 class VisualizationGenerator:
     """Generate data for 3D helix and circuit diagram visualizations."""
@@ -18,76 +149,57 @@ class VisualizationGenerator:
         Returns:
             Dictionary with 3D coordinates, base colors, and hydrogen bonds
         """
-        base_colors = {"A": "#FF6B6B", "T": "#4ECDC4", "G": "#45B7D1", "C": "#FFA07A"}
-        complement_map = {"A": "T", "T": "A", "G": "C", "C": "G"}
+        # All coordinates come from one vectorized (or compiled) pass; the loop
+        # below only packages them (the complementary strand is the point
+        # reflection) with attributes computed once per distinct letter
+        positions, backbone_points = _helix_geometry(len(sequence), radius)
+        strand1 = positions.tolist()
+        strand2 = (positions * np.array([-1.0, -1.0, 1.0])).tolist() if with_complementary else None
+
+        pair_table = {base: _base_pair(base) for base in set(sequence)}
 
         bases = []
         hydrogen_bonds = []
 
         for i, base in enumerate(sequence):
-            angle = (i / len(sequence)) * 4 * np.pi  # Two full rotations per strand
-            height = i * 0.34  # DNA rise: 0.34 nm per base pair
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            z = height
-
+            color, comp_base, comp_color, bond_strength, pair = pair_table[base]
             bases.append({
-                "position": [float(x), float(y), float(z)],
+                "position": strand1[i],
                 "base": base,
-                "color": base_colors.get(base, "#888888"),
+                "color": color,
                 "index": i,
                 "strand": 1
             })
 
             # Generate complementary strand with hydrogen bonds
             if with_complementary:
-                comp_base = complement_map.get(base, "A")
                 # Complementary strand is on opposite side
-                comp_x = -radius * np.cos(angle)
-                comp_y = -radius * np.sin(angle)
-                comp_z = height
-
                 bases.append({
-                    "position": [float(comp_x), float(comp_y), float(comp_z)],
+                    "position": strand2[i],
                     "base": comp_base,
-                    "color": base_colors.get(comp_base, "#888888"),
+                    "color": comp_color,
                     "index": i,
                     "strand": 2
                 })
 
                 # Hydrogen bonds connect base pairs
-                # A-T has 2 hydrogen bonds, G-C has 3 hydrogen bonds
-                if base in ['A', 'T']:
-                    bond_strength = 2
-                else:  # G-C pair
-                    bond_strength = 3
-
+                # Bonds share the bases' position lists; both are only serialized
                 hydrogen_bonds.append({
-                    "from": [float(x), float(y), float(z)],
-                    "to": [float(comp_x), float(comp_y), float(comp_z)],
+                    "from": strand1[i],
+                    "to": strand2[i],
                     "strength": bond_strength,
-                    "bases": f"{base}-{comp_base}",
+                    "bases": pair,
                     "index": i
                 })
 
         # Generate sugar-phosphate backbone (both strands)
         backbone = []
-        for i in range(0, len(sequence), 3):
-            angle = (i / len(sequence)) * 4 * np.pi
-            height = i * 0.34
+        for x, y, z in backbone_points.tolist():
             # Strand 1 backbone
-            backbone.append({
-                "x": float(radius * 0.5 * np.cos(angle)),
-                "y": float(radius * 0.5 * np.sin(angle)),
-                "z": float(height),
-            })
+            backbone.append({"x": x, "y": y, "z": z})
             # Strand 2 backbone (if complementary enabled)
             if with_complementary:
-                backbone.append({
-                    "x": float(-radius * 0.5 * np.cos(angle)),
-                    "y": float(-radius * 0.5 * np.sin(angle)),
-                    "z": float(height),
-                })
+                backbone.append({"x": -x, "y": -y, "z": z})
 
         result = {
             "bases": bases,
@@ -111,43 +223,7 @@ class VisualizationGenerator:
         Returns:
             Dictionary with circuit gates and topology
         """
-        num_qubits = len(sequence) * 3
-        gates = []
-        
-        if algorithm == "vqe":
-            # VQE circuit: encode -> parameterized rotations -> measure
-            gates.append({"type": "encoding", "qubits": list(range(num_qubits)), "label": "PhysioQ Encode"})
-            for i in range(0, num_qubits, 3):
-                gates.append({"type": "ry", "qubits": [i + 1], "angle": f"θ_{i//3}", "label": f"H-Bond"})
-            gates.append({"type": "measurement", "qubits": list(range(num_qubits)), "label": "Measure"})
-        
-        elif algorithm == "qaoa":
-            # QAOA circuit: encode -> cost -> mixer -> repeat -> measure
-            gates.append({"type": "encoding", "qubits": list(range(min(num_qubits, 20))), "label": "Encode"})
-            for p in range(2):
-                gates.append({"type": "cost", "qubits": list(range(min(num_qubits, 20))), "label": f"Cost(γ_{p})"})
-                gates.append({"type": "mixer", "qubits": list(range(min(num_qubits, 20))), "label": f"Mixer(β_{p})"})
-            gates.append({"type": "measurement", "qubits": list(range(min(num_qubits, 20))), "label": "Measure"})
-        
-        elif algorithm == "qcnn":
-            # QCNN circuit: encode -> convolution -> pooling -> classifier
-            current_qubits = num_qubits
-            layer = 0
-            while current_qubits > 1:
-                gates.append({"type": "conv", "qubits": list(range(min(current_qubits, 12))), "label": f"Conv_{layer}"})
-                gates.append({"type": "pool", "qubits": list(range(min(current_qubits // 2, 6))), "label": f"Pool_{layer}"})
-                current_qubits = current_qubits // 2
-                layer += 1
-            gates.append({"type": "classifier", "qubits": [0], "label": "Classify"})
-            gates.append({"type": "measurement", "qubits": [0], "label": "Measure"})
-        
-        return {
-            "algorithm": algorithm,
-            "num_qubits": num_qubits,
-            "gates": gates,
-            "depth": len(gates),
-            "sequence_length": len(sequence),
-        }
+        return _circuit_layout(len(sequence), algorithm)
 
     @staticmethod
     def generate_alignment_visualization(aligned_seq1: str, aligned_seq2: str, path: str) -> Dict:
@@ -161,41 +237,32 @@ class VisualizationGenerator:
         Returns:
             Dictionary with visualization segments
         """
-        segments = []
         color_map = {"E": "#4ECDC4", "I": "#FF6B6B"}  # Match/Mismatch colors
         
-        current_color = None
-        current_start = 0
+        # Run-length encode the path: a run starts at 0 and at every change
+        codes = np.frombuffer(path.encode("ascii"), dtype=np.uint8)
+        changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        starts = np.concatenate(([0], changes)).tolist()
+        ends = np.concatenate((changes, [len(codes)])).tolist()
         
-        for i, p in enumerate(path):
-            if current_color is None:
-                current_color = p
-                current_start = i
-            elif p != current_color:
-                segments.append({
-                    "type": "E" if current_color == "E" else "I",
-                    "start": current_start,
-                    "end": i,
-                    "length": i - current_start,
-                    "color": color_map[current_color],
-                    "label": "Match" if current_color == "E" else "Mismatch",
-                })
-                current_color = p
-                current_start = i
-        
-        segments.append({
-            "type": "E" if current_color == "E" else "I",
-            "start": current_start,
-            "end": len(path),
-            "length": len(path) - current_start,
-            "color": color_map[current_color],
-            "label": "Match" if current_color == "E" else "Mismatch",
-        })
+        segments = []
+        for start, end in zip(starts, ends):
+            current_color = path[start]
+            segments.append({
+                "type": "E" if current_color == "E" else "I",
+                "start": start,
+                "end": end,
+                "length": end - start,
+                "color": color_map[current_color],
+                "label": "Match" if current_color == "E" else "Mismatch",
+            })
         
+        match_count = path.count("E")
+        mismatch_count = path.count("I")
         return {
             "segments": segments,
             "total_length": len(path),
-            "match_count": path.count("E"),
-            "mismatch_count": path.count("I"),
-            "identity": (path.count("E") / len(path)) * 100,
+            "match_count": match_count,
+            "mismatch_count": mismatch_count,
+            "identity": (match_count / len(path)) * 100,
         }
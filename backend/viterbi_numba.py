@@ -0,0 +1,191 @@
+"""
+Numba-compiled Viterbi kernels
+Log-space dynamic programming used by the classical Viterbi baseline
+"""
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+
+@njit(cache=True)
+def viterbi_log_into(obs, n_obs, log_start, log_trans, log_emit_T,
+                     dp_prev, dp_curr, bp_out, path_out):
+    """
+    Decode the most likely hidden state path in log space into caller buffers
+
+    Args:
+        obs: uint8 array of observation indices (A=0, C=1, G=2, T=3)
+        n_obs: number of observations of obs to decode
+        log_start: (N,) log initial state probabilities
+        log_trans: (N, N) log transition probabilities [from][to]
+        log_emit_T: (4, N) log emission probabilities [nucleotide][state]
+        dp_prev, dp_curr: (N,) float32 scratch columns
+        bp_out: (>= n_obs, N) int8 backpointer scratch
+        path_out: (>= n_obs,) int8 array receiving the state path
+
+    Returns:
+        Log probability of the best path
+    """
+    n_states = log_start.shape[0]
+
+    for j in range(n_states):
+        dp_prev[j] = log_start[j] + log_emit_T[obs[0], j]
+
+    # delta_t(j) = max_i [delta_{t-1}(i) + log a_ij] + log b_j(o_t)
+    for t in range(1, n_obs):
+        for j in range(n_states):
+            best = dp_prev[0] + log_trans[0, j]
+            arg = 0
+            for i in range(1, n_states):
+                v = dp_prev[i] + log_trans[i, j]
+                if v > best:
+                    best = v
+                    arg = i
+            dp_curr[j] = best + log_emit_T[obs[t], j]
+            bp_out[t, j] = arg
+        dp_prev, dp_curr = dp_curr, dp_prev
+
+    # Backtrace from the best final state
+    last = 0
+    logprob = dp_prev[0]
+    for j in range(1, n_states):
+        if dp_prev[j] > logprob:
+            logprob = dp_prev[j]
+            last = j
+    path_out[n_obs - 1] = last
+    for t in range(n_obs - 1, 0, -1):
+        path_out[t - 1] = bp_out[t, path_out[t]]
+
+    return logprob
+
+
+@njit(cache=True)
+def viterbi_log_n2_into(obs, n_obs, log_start, log_trans, log_emit_T,
+                        dp_prev, dp_curr, bp_out, path_out):
+    """
+    Two-state specialization of viterbi_log_into
+
+    The predecessor choice is written as conditional expressions so LLVM
+    lowers it to selects instead of an unpredictable branch per cell.
+    delta lives in registers, so dp_prev/dp_curr are accepted only to keep
+    the signature interchangeable with viterbi_log_into.
+    """
+    t00 = log_trans[0, 0]
+    t01 = log_trans[0, 1]
+    t10 = log_trans[1, 0]
+    t11 = log_trans[1, 1]
+
+    d0 = log_start[0] + log_emit_T[obs[0], 0]
+    d1 = log_start[1] + log_emit_T[obs[0], 1]
+
+    for t in range(1, n_obs):
+        a0 = d0 + t00
+        b0 = d1 + t10
+        a1 = d0 + t01
+        b1 = d1 + t11
+        bp_out[t, 0] = 0 if a0 >= b0 else 1
+        bp_out[t, 1] = 0 if a1 >= b1 else 1
+        d0 = (a0 if a0 >= b0 else b0) + log_emit_T[obs[t], 0]
+        d1 = (a1 if a1 >= b1 else b1) + log_emit_T[obs[t], 1]
+
+    path_out[n_obs - 1] = 0 if d0 >= d1 else 1
+    for t in range(n_obs - 1, 0, -1):
+        path_out[t - 1] = bp_out[t, path_out[t]]
+
+    return d0 if d0 >= d1 else d1
+
+
+@njit(cache=True)
+def viterbi_log(obs, log_start, log_trans, log_emit_T):
+    """
+    Decode the most likely hidden state path in log space
+
+    Args:
+        obs: uint8 array of observation indices (A=0, C=1, G=2, T=3)
+        log_start: (N,) log initial state probabilities
+        log_trans: (N, N) log transition probabilities [from][to]
+        log_emit_T: (4, N) log emission probabilities [nucleotide][state]
+
+    Returns:
+        Tuple of (log probability of the best path, int8 state path)
+    """
+    n_obs = obs.shape[0]
+    n_states = log_start.shape[0]
+
+    # Only the previous column of delta is needed; int8 backpointers
+    # (n_states <= 127) keep the O(T*N) surface small
+    dp_prev = np.empty(n_states, dtype=np.float32)
+    dp_curr = np.empty(n_states, dtype=np.float32)
+    bp = np.empty((n_obs, n_states), dtype=np.int8)
+    path = np.empty(n_obs, dtype=np.int8)
+
+    logprob = viterbi_log_into(obs, n_obs, log_start, log_trans, log_emit_T,
+                               dp_prev, dp_curr, bp, path)
+    return logprob, path
+
+
+@njit(cache=True)
+def viterbi_log_n2(obs, log_start, log_trans, log_emit_T):
+    """
+    Two-state specialization of viterbi_log
+
+    Arguments and return value match viterbi_log.
+    """
+    n_obs = obs.shape[0]
+    scratch = np.empty(2, dtype=np.float32)
+    bp = np.empty((n_obs, 2), dtype=np.int8)
+    path = np.empty(n_obs, dtype=np.int8)
+
+    logprob = viterbi_log_n2_into(obs, n_obs, log_start, log_trans, log_emit_T,
+                                  scratch, scratch, bp, path)
+    return logprob, path
+
+
+@njit(parallel=True, cache=True)
+def _batch_viterbi_log(obs_matrix, lengths, log_start, log_trans, log_emit_T, n_chunks):
+    """Parallel body of batch_viterbi_log over n_chunks strided row chunks"""
+    n_seqs, max_len = obs_matrix.shape
+    n_states = log_start.shape[0]
+    logprobs = np.empty(n_seqs, dtype=np.float64)
+    paths = np.zeros(obs_matrix.shape, dtype=np.int8)
+    two_states = n_states == 2
+
+    # Rows are dealt out in one strided chunk per worker thread; each chunk
+    # sizes its scratch once and reuses it for every row it decodes, and
+    # paths are written straight into the output matrix
+    for c in prange(n_chunks):
+        dp_prev = np.empty(n_states, dtype=np.float32)
+        dp_curr = np.empty(n_states, dtype=np.float32)
+        bp = np.empty((max_len, n_states), dtype=np.int8)
+        for b in range(c, n_seqs, n_chunks):
+            if two_states:
+                logprobs[b] = viterbi_log_n2_into(
+                    obs_matrix[b], lengths[b], log_start, log_trans, log_emit_T,
+                    dp_prev, dp_curr, bp, paths[b],
+                )
+            else:
+                logprobs[b] = viterbi_log_into(
+                    obs_matrix[b], lengths[b], log_start, log_trans, log_emit_T,
+                    dp_prev, dp_curr, bp, paths[b],
+                )
+
+    return logprobs, paths
+
+
+def batch_viterbi_log(obs_matrix, lengths, log_start, log_trans, log_emit_T):
+    """
+    Decode many sequences in parallel, one independent Viterbi per row
+
+    Args:
+        obs_matrix: (B, T_max) uint8 observations, rows padded past their length
+        lengths: (B,) int32 true length of each row
+        log_start: (N,) log initial state probabilities
+        log_trans: (N, N) log transition probabilities [from][to]
+        log_emit_T: (4, N) log emission probabilities [nucleotide][state]
+
+    Returns:
+        Tuple of ((B,) log probabilities, (B, T_max) int8 state paths)
+    """
+    # Read outside the kernel: get_num_threads() inside it defeats cache=True
+    n_chunks = max(1, min(get_num_threads(), obs_matrix.shape[0]))
+    return _batch_viterbi_log(obs_matrix, lengths, log_start, log_trans, log_emit_T, n_chunks)
@@ -1,8 +1,32 @@
 from __future__ import annotations
+import functools
 import numpy as np
 from typing import Dict, List, Tuple
 from .physioq_encoder import PhysioQEncoder
 
+try:
+    from .alignment_numba import nw_fill_into, nw_traceback_into
+except ImportError:
+    # Numba not installed: fill the matrix by anti-diagonals with NumPy instead
+    nw_fill_into = nw_traceback_into = None
+
+
+@functools.lru_cache(maxsize=256)
+def _gap_boundary(length: int, gap_penalty: float) -> np.ndarray:
+    """Read-only first row/column of the score matrix: 0, g, 2g, ..."""
+    boundary = np.arange(length + 1, dtype=float) * gap_penalty
+    boundary.flags.writeable = False
+    return boundary
+
+
+def _path_runs(path: str) -> List[List]:
+    """Run-length encode an E/I alignment path as [type, length] pairs"""
+    codes = np.frombuffer(path.encode("ascii"), dtype=np.uint8)
+    changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], changes))
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+    return [[path[start], length] for start, length in zip(starts.tolist(), lengths.tolist())] if path else []
+
 
 class VQEAlignment:
     """Deterministic Needleman–Wunsch alignment with convergence trace.
@@ -32,16 +56,28 @@ class VQEAlignment:
 
     def _init_matrices(self, n: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
         scores = np.zeros((n + 1, m + 1))
-        traceback = np.zeros((n + 1, m + 1), dtype=int)  # 0 diag, 1 up, 2 left
-        for i in range(1, n + 1):
-            scores[i, 0] = i * self.gap_penalty
-            traceback[i, 0] = 1
-        for j in range(1, m + 1):
-            scores[0, j] = j * self.gap_penalty
-            traceback[0, j] = 2
+        traceback = np.zeros((n + 1, m + 1), dtype=np.uint8)  # 0 diag, 1 up, 2 left
+        # Boundaries depend only on the lengths and gap penalty, so reuse them
+        scores[:, 0] = _gap_boundary(n, self.gap_penalty)
+        scores[0, :] = _gap_boundary(m, self.gap_penalty)
+        traceback[1:, 0] = 1
+        traceback[0, 1:] = 2
         return scores, traceback
 
     def _traceback(self, traceback: np.ndarray, seq1: str, seq2: str) -> Tuple[str, str, str]:
+        if nw_traceback_into is not None:
+            # Compiled walk into byte buffers filled from the end, so no
+            # per-step appends and no reversal
+            size = len(seq1) + len(seq2)
+            buffers = np.empty((3, size), dtype=np.uint8)
+            start = nw_traceback_into(
+                np.frombuffer(seq1.encode("ascii"), dtype=np.uint8),
+                np.frombuffer(seq2.encode("ascii"), dtype=np.uint8),
+                traceback, buffers[0], buffers[1], buffers[2],
+            )
+            aligned1, aligned2, path = (row[start:].tobytes().decode("ascii") for row in buffers)
+            return aligned1, aligned2, path
+
         aligned1: List[str] = []
         aligned2: List[str] = []
         path: List[str] = []
@@ -69,72 +105,124 @@ class VQEAlignment:
     def _fill(self, seq1: str, seq2: str) -> Tuple[np.ndarray, np.ndarray, List[Dict]]:
         n, m = len(seq1), len(seq2)
         scores, traceback = self._init_matrices(n, m)
-        history: List[Dict] = []
-        for i in range(1, n + 1):
-            for j in range(1, m + 1):
-                match = scores[i - 1, j - 1] + (self.match_score if seq1[i - 1] == seq2[j - 1] else self.mismatch_penalty)
-                delete = scores[i - 1, j] + self.gap_penalty
-                insert = scores[i, j - 1] + self.gap_penalty
-                best = max(match, delete, insert)
-                scores[i, j] = best
-                if best == match:
-                    traceback[i, j] = 0
-                elif best == delete:
-                    traceback[i, j] = 1
-                else:
-                    traceback[i, j] = 2
-            # After each row, capture an energy-like metric: negative of best score so far
-            history.append({"iteration": i, "energy": float(-scores[i, :].max())})
+        if nw_fill_into is not None:
+            energies = np.empty(n)
+            nw_fill_into(
+                np.frombuffer(seq1.encode("ascii"), dtype=np.uint8),
+                np.frombuffer(seq2.encode("ascii"), dtype=np.uint8),
+                self.match_score, self.mismatch_penalty, self.gap_penalty,
+                scores, traceback, energies,
+            )
+            history = [{"iteration": i, "energy": energy} for i, energy in enumerate(energies.tolist(), start=1)]
+            return scores, traceback, history
+
+        # Without Numba, fill one anti-diagonal (i + j == d) at a time: its
+        # cells depend only on the two previous diagonals
+        s1 = np.frombuffer(seq1.encode("ascii"), dtype=np.uint8)
+        s2 = np.frombuffer(seq2.encode("ascii"), dtype=np.uint8)
+        for d in range(2, n + m + 1):
+            i = np.arange(max(1, d - m), min(n, d - 1) + 1)
+            j = d - i
+            match = scores[i - 1, j - 1] + np.where(s1[i - 1] == s2[j - 1], self.match_score, self.mismatch_penalty)
+            delete = scores[i - 1, j] + self.gap_penalty
+            insert = scores[i, j - 1] + self.gap_penalty
+            best = np.maximum(np.maximum(match, delete), insert)
+            scores[i, j] = best
+            # Ties resolve diagonal first, then up, then left
+            traceback[i, j] = np.where(best == match, 0, np.where(best == delete, 1, 2))
+
+        # Energy-like metric per row: negative of the row's best score
+        history = [{"iteration": i, "energy": energy} for i, energy in enumerate((-scores[1:].max(axis=1)).tolist(), start=1)]
         return scores, traceback, history
 
-    def align_windowed(self, seq1: str, seq2: str, window_size: int = 100, overlap: int = 20) -> Dict:
-        """Align long sequences using windowing approach."""
+    def align_windowed(
+        self,
+        seq1: str,
+        seq2: str,
+        window_size: int = 100,
+        overlap: int = 20,
+        band: int = 1,
+        compact_path: bool = False,
+    ) -> Dict:
+        """Align long sequences using windowing approach.
+
+        Window k of seq1 is paired with windows k - band .. k + band of seq2,
+        i.e. the windows near the same offset, as for globally similar inputs.
+        With compact_path the combined path is returned as run-length
+        "path_segments" ([type, length] pairs) instead of the full
+        "alignment_path" string.
+        """
         seq1, seq2 = self._validate_inputs(seq1, seq2)
         
         if len(seq1) <= window_size and len(seq2) <= window_size:
-            return self.align(seq1, seq2)
+            return self._align_validated(seq1, seq2)
         
         all_alignments = []
         all_paths = []
+        path_segments: List[List] = []
         total_score = 0.0
+        # Repeated window pairs (e.g. tandem repeats) are aligned once
+        aligned: Dict[Tuple[str, str], Dict] = {}
         
-        # Slide windows across sequences
-        for start1 in range(0, len(seq1), window_size - overlap):
+        # Slide windows along the diagonal band of window pairs
+        step = window_size - overlap
+        starts1 = range(0, len(seq1), step)
+        starts2 = range(0, len(seq2), step)
+        for k1, start1 in enumerate(starts1):
             end1 = min(start1 + window_size, len(seq1))
-            for start2 in range(0, len(seq2), window_size - overlap):
+            for k2 in range(max(0, k1 - band), min(len(starts2), k1 + band + 1)):
+                start2 = starts2[k2]
                 end2 = min(start2 + window_size, len(seq2))
                 
                 window_seq1 = seq1[start1:end1]
                 window_seq2 = seq2[start2:end2]
                 
-                result = self.align(window_seq1, window_seq2)
+                result = aligned.get((window_seq1, window_seq2))
+                if result is None:
+                    # Windows of validated sequences need no validation
+                    result = self._align_validated(window_seq1, window_seq2)
+                    aligned[window_seq1, window_seq2] = result
                 all_alignments.append({
                     "window": f"({start1}-{end1}, {start2}-{end2})",
                     "score": result["alignment_score"],
                     "length": len(result["alignment_path"]),
                 })
-                all_paths.append(result["alignment_path"])
+                if compact_path:
+                    runs = _path_runs(result["alignment_path"])
+                    # Merge a run continuing across the window boundary
+                    if path_segments and path_segments[-1][0] == runs[0][0]:
+                        path_segments[-1][1] += runs.pop(0)[1]
+                    path_segments.extend(runs)
+                else:
+                    all_paths.append(result["alignment_path"])
                 total_score += result["alignment_score"]
         
         avg_score = total_score / max(1, len(all_alignments))
-        combined_path = "".join(all_paths)
         
-        return {
+        windowed = {
             "algorithm": "VQE-Windowed",
             "windowed": True,
             "window_size": window_size,
             "overlap": overlap,
+            "band": band,
             "windows_processed": len(all_alignments),
             "average_score": avg_score,
             "alignment_score": avg_score,
             "final_energy": float(-avg_score),
-            "alignment_path": combined_path,
             "convergence": [{"iteration": i, "energy": float(-s["score"])} for i, s in enumerate(all_alignments)],
             "window_results": all_alignments,
         }
+        if compact_path:
+            windowed["path_segments"] = path_segments
+        else:
+            windowed["alignment_path"] = "".join(all_paths)
+        return windowed
 
     def align(self, seq1: str, seq2: str) -> Dict:
         seq1, seq2 = self._validate_inputs(seq1, seq2)
+        return self._align_validated(seq1, seq2)
+
+    def _align_validated(self, seq1: str, seq2: str) -> Dict:
         scores, traceback, history = self._fill(seq1, seq2)
         score = float(scores[-1, -1])
         aligned1, aligned2, path = self._traceback(traceback, seq1, seq2)
@@ -155,3 +243,8 @@ class VQEAlignment:
             "convergence": history,
             "qubits": (len(seq1) + len(seq2)) * 3,
         }
+
+
+def warm_up():
+    """Compile the Numba alignment kernel ahead of the first request"""
+    VQEAlignment().align("ACGT", "AGT")
@@ -59,7 +59,7 @@ export default function App() {
   const fetchRuns = async () => {
     setRunsLoading(true)
     try {
-      const res = await fetch(`${API_BASE}/runs`)
+      const res = await fetch(`${API_BASE}/runs?summary=true`)
       if (res.ok) setRuns(await res.json())
     } catch {}
     finally { setRunsLoading(false) }
@@ -448,7 +448,7 @@ export default function App() {
                       onChange={(e) => setDecodingMethod(e.target.value)}
                       disabled={loading}
                     />
-                    <span style={{ marginLeft: '8px' }}>📊 Classical Viterbi (hmmlearn)</span>
+                    <span style={{ marginLeft: '8px' }}>📊 Classical Viterbi (DP)</span>
                   </label>
                   <label style={{ display: 'flex', alignItems: 'center', cursor: 'pointer' }}>
                     <input
